@@ -0,0 +1,33 @@
+import asyncio
+import base
+import asyncsearch
+import unittest
+
+class Test(unittest.TestCase):
+    def test_async_search(self):
+        a = (base.b0*base.b5*base.b3).Inverse()
+        progress = []
+        moves = asyncio.run(asyncsearch.async_search(a, on_progress=lambda d, n: progress.append(d)))
+        self.assertEqual(3, len(moves))
+        self.assertTrue(base.apply_moves(a, moves).IsIdentity())
+        self.assertEqual([1, 2], progress)
+    def test_async_timeout(self):
+        a = (base.b0*base.b5*base.b3*base.b0*base.b1*base.b2*base.b4*base.b3).Inverse()
+        self.assertEqual(None, asyncio.run(asyncsearch.async_search(a, timeout=0.05, report=100)))
+    def test_async_cancel(self):
+        a = (base.b0*base.b5*base.b3*base.b0*base.b1*base.b2*base.b4*base.b3).Inverse()
+        async def run():
+            task = asyncio.ensure_future(asyncsearch.async_search(a, report=100))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                return True
+            return False
+        self.assertTrue(asyncio.run(run()))
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
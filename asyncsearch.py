@@ -0,0 +1,61 @@
+"""
+Description:
+  asyncio interface to the searches.
+
+  async_search runs problem1.breath_search_steps in an executor, so a
+  slow scramble does not block the event loop or other requests, and
+  returns the first solution found (None if there is none within
+  max_depth or timeout seconds). when the awaiting task is cancelled or
+  the timeout expires the search is told to stop and ends at its next
+  progress step, so no thread keeps searching in the background.
+
+  the default executor of the loop (threads) is used unless another one
+  is given; a concurrent.futures.ProcessPoolExecutor runs the search in
+  a worker process, which then only stops at the timeout and does not
+  report progress.
+
+  on_progress, if given, is called in the event loop with (depth,
+  nodes) for every progress step of the search.
+"""
+import asyncio
+import concurrent.futures
+import threading
+import time
+import problem1
+
+def _search(a, max_depth, report, deadline, stop, on_progress):
+    # runs in the executor; returns the first solution or None
+    for event in problem1.breath_search_steps(a, max_depth, report):
+        if event[0] == 'solution':
+            return event[1]
+        if on_progress is not None:
+            on_progress(event[1], event[2])
+        if stop is not None and stop.is_set():
+            return None
+        if deadline is not None and time.time() > deadline:
+            return None
+    return None
+
+async def async_search(a, timeout=None, executor=None, max_depth=20,
+                       report=10000, on_progress=None):
+    loop = asyncio.get_running_loop()
+    deadline = None
+    if timeout is not None:
+        deadline = time.time() + timeout
+    stop = None
+    progress = None
+    if not isinstance(executor, concurrent.futures.ProcessPoolExecutor):
+        stop = threading.Event()
+        if on_progress is not None:
+            progress = lambda depth, nodes: loop.call_soon_threadsafe(on_progress, depth, nodes)
+    future = loop.run_in_executor(executor, _search, a.Freeze(), max_depth,
+                                  report, deadline, stop, progress)
+    try:
+        return await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        return None
+    finally:
+        if stop is not None:
+            stop.set()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
@@ -14,6 +14,18 @@ class Test(unittest.TestCase):
         for p in base.B:
             for fp in base.fixed_points:
                 self.assertTrue(p.Image(fp) == fp)
+    def test_opposite_faces_commute(self):
+        for i in range(len(base.B)):
+            j = base.opposite[i]
+            self.assertEqual(i, base.opposite[j])
+            self.assertEqual(base.B[i]*base.B[j], base.B[j]*base.B[i])
+            for k in range(len(base.B)):
+                if k != i and k != j:
+                    self.assertNotEqual(base.B[i]*base.B[k], base.B[k]*base.B[i])
+    def test_apply_moves(self):
+        self.assertEqual(base.b3*base.b0*base.b2, base.apply_moves(base.b2, [0, 3]))
+        self.assertTrue(base.apply_moves(base.b1, [1, 1, 1]).IsIdentity())
+        self.assertEqual(base.b4, base.apply_moves(base.b4, []))
 
 if __name__ == '__main__':
     unittest.main()
@@ -17,24 +17,43 @@ Description:
   note that there are some fixed points in this model
 
 Data:
-  B ... array of 6 base permutations
+  B ... array of 6 base permutations (byteperm: frozen and stored as bytes,
+        so they can be hashed and products with states are computed
+        by bytes.translate and stay frozen)
   N ... number of small faces
   fixed_points ... array of fixed points
+  opposite ... opposite[i] is the index of the base permutation turning
+               the face opposite to the one of B[i]; these two commute
+
+Functions:
+  apply_moves(state, moves) ... state after the moves, indices into B
 """
 
-from perm import perm
+from perm import byteperm
 
-b0 = perm([(1+3*i,19+3*i,37+3*i,46+3*i) for i in range(3)]+[(10,12,18,16),(11,15,17,13)])
-b1 = perm([(3+3*i,21+3*i,39+3*i,48+3*i) for i in range(3)]+[(30,28,34,36),(29,31,35,33)])
+b0 = byteperm.from_cycles([(1+3*i,19+3*i,37+3*i,46+3*i) for i in range(3)]+[(10,12,18,16),(11,15,17,13)])
+b1 = byteperm.from_cycles([(3+3*i,21+3*i,39+3*i,48+3*i) for i in range(3)]+[(30,28,34,36),(29,31,35,33)])
 
-b2 = perm([(10+i,19+i,28+i,54-i) for i in range(3)]+[(1,7,9,3),(4,8,6,2)])
-b3 = perm([(16+i,25+i,34+i,48-i) for i in range(3)]+[(43,37,39,45),(40,38,42,44)])
+b2 = byteperm.from_cycles([(10+i,19+i,28+i,54-i) for i in range(3)]+[(1,7,9,3),(4,8,6,2)])
+b3 = byteperm.from_cycles([(16+i,25+i,34+i,48-i) for i in range(3)]+[(43,37,39,45),(40,38,42,44)])
 
-b4 = perm([(7+i,18-3*i,39-i,28+3*i) for i in range(3)]+[(19,25,27,21),(22,26,24,20)])
-b5 = perm([(1+i,16-3*i,45-i,30+3*i) for i in range(3)]+[(52,46,48,54),(49,47,51,53)])
+b4 = byteperm.from_cycles([(7+i,18-3*i,39-i,28+3*i) for i in range(3)]+[(19,25,27,21),(22,26,24,20)])
+b5 = byteperm.from_cycles([(1+i,16-3*i,45-i,30+3*i) for i in range(3)]+[(52,46,48,54),(49,47,51,53)])
 
 B = [b0,b1,b2,b3,b4,b5]
 
 N = 9*6
 
 fixed_points = [5,14,23,32,41,50]
+
+opposite = [1,0,3,2,5,4]
+
+def apply_moves(state, moves):
+    """
+    returns B[mk]*...*B[m1]*B[m0]*state for moves [m0, m1, ..., mk],
+    the state after the moves in the format of the solutions of
+    problem1.breath_search.
+    """
+    for j in moves:
+        state = B[j]*state
+    return state
@@ -0,0 +1,60 @@
+import base
+import batch
+import io
+import json
+import unittest
+
+LINES = ['[0, 5, 3]\n',
+         '\n',
+         '{"id": "b", "moves": [2, 2]}\n',
+         '{"id": "c", "image": %s}\n' % json.dumps([(base.b4*base.b1)[i] for i in range(base.N+1)]),
+         '[7]\n',
+         'nonsense\n',
+         '{"image": 5}\n',
+         '{"moves": "abc"}\n',
+         '[0]\n']
+
+class Test(unittest.TestCase):
+    def run_batch(self, **kwargs):
+        output = io.StringIO()
+        times = batch.run(LINES, output, processes=2, **kwargs)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        return times, results
+    def test_parse_line(self):
+        key, state = batch.parse_line('{"id": 3, "moves": [1, 4]}')
+        self.assertEqual(3, key)
+        self.assertEqual(base.b4*base.b1, state)
+        self.assertRaises(ValueError, batch.parse_line, '[6]')
+        self.assertRaises(ValueError, batch.parse_line, '{"x": 1}')
+        self.assertRaises(ValueError, batch.parse_line, '{"image": 5}')
+        self.assertRaises(ValueError, batch.parse_line, '{"image": ["a"]}')
+        self.assertRaises(ValueError, batch.parse_line, '"abc"')
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(50, batch.percentile(values, 50))
+        self.assertEqual(99, batch.percentile(values, 99))
+        self.assertEqual(7, batch.percentile([7], 99))
+    def test_run_in_order(self):
+        times, results = self.run_batch(solver='bidirectional')
+        self.assertEqual(8, len(times))
+        self.assertEqual(list(range(8)), [r['index'] for r in results])
+        self.assertEqual(['ok', 'ok', 'ok', 'error', 'error', 'error', 'error', 'ok'],
+                         [r['status'] for r in results])
+        self.assertTrue(base.apply_moves(base.b0, results[7]['solution']).IsIdentity())
+        self.assertEqual(['b', 'c'], [results[1]['id'], results[2]['id']])
+        scrambles = [base.b3*base.b5*base.b0, base.b2*base.b2, base.b4*base.b1]
+        for state, result in zip(scrambles, results):
+            self.assertTrue(base.apply_moves(state, result['solution']).IsIdentity())
+    def test_run_unordered_timeout(self):
+        lines = ['[0, 5, 3, 0, 1, 2, 4, 3, 5, 1, 2]\n', '[1]\n']
+        output = io.StringIO()
+        batch.run(lines, output, 'breath', 2, 0.2, True)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([1, 0], [r['index'] for r in results])
+        self.assertEqual(['ok', 'timeout'], [r['status'] for r in results])
+        self.assertEqual(None, results[1]['solution'])
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
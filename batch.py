@@ -0,0 +1,200 @@
+"""
+Description:
+  batch solver reading scrambles as JSON lines and writing the results
+  as JSON lines.
+
+    python batch.py [-i scrambles.jsonl] [-o results.jsonl] [options]
+
+  every input line is one scramble, either a list of indices into
+  base.B (the moves applied to the solved cube, in the format of the
+  solutions of problem1.breath_search) or an object with one of the
+  keys "moves" or "image" (the images of the points 0..base.N) and an
+  optional "id". input is read from stdin unless given and processed as
+  it arrives.
+
+  the scrambles are solved on a process pool; a task still running
+  after --timeout seconds is interrupted (SIGALRM in the worker) and
+  reported as a timeout. every output line holds the "index" of the
+  input line, the "id" if given, "status" ("ok", "timeout", "error"),
+  the "solution" (list of indices into base.B, null if none was found),
+  and "time", the seconds spent solving. results are written in input
+  order, or with --unordered as soon as they are done.
+
+  at the end the number of scrambles, solves per second and the 50th
+  and 99th percentile of the solving time are printed to stderr.
+
+  solvers: breath (problem1.breath_search), bidirectional
+  (problem1.bidirectional_search), ida (ida.ida_search), twophase
+  (twophase.twophase_search, --tables keeps its tables in a file; they
+  are built or loaded once before the workers start).
+"""
+import argparse
+import json
+import multiprocessing
+import signal
+import sys
+import time
+import base
+import ida
+import problem1
+import twophase
+from perm import frozenperm
+
+SOLVERS = {'breath': problem1.breath_search,
+           'bidirectional': problem1.bidirectional_search,
+           'ida': ida.ida_search,
+           'twophase': twophase.twophase_search}
+
+def scramble_state(moves):
+    return base.apply_moves(base.b0.Identity(), moves).Freeze()
+
+def parse_line(line):
+    """
+    returns (id, state) of an input line, raises ValueError if it is
+    not a valid scramble.
+    """
+    data = json.loads(line)
+    key = None
+    if isinstance(data, dict):
+        key = data.get('id')
+        if 'moves' in data:
+            data = data['moves']
+        elif 'image' in data:
+            image = data['image']
+            if not isinstance(image, list) or not all([isinstance(x, int) for x in image]):
+                raise ValueError("batch: expected a list of points as image")
+            return key, frozenperm.from_image(image)
+        else:
+            raise ValueError("batch: expected a 'moves' or 'image' key")
+    if not isinstance(data, list):
+        raise ValueError("batch: expected a list of moves")
+    for j in data:
+        if not isinstance(j, int) or not 0 <= j < len(base.B):
+            raise ValueError("batch: invalid move %r" % (j,))
+    return key, scramble_state(data)
+
+def percentile(values, q):
+    """
+    returns the q-th percentile (nearest rank) of the sorted values.
+    """
+    if not values:
+        return None
+    k = max(0, min(len(values)-1, int(q*len(values)/100.0 + 0.5) - 1))
+    return values[k]
+
+# worker side
+
+class _timeout(Exception):
+    pass
+
+def _alarm(signum, frame):
+    raise _timeout()
+
+_solver = None
+_task_timeout = None
+
+def _init_worker(solver, timeout, tables):
+    global _solver, _task_timeout
+    _solver = SOLVERS[solver]
+    _task_timeout = timeout
+    if solver == 'twophase':
+        # inherited from run() when forked, else loaded from the file
+        twophase.init_tables(tables)
+    signal.signal(signal.SIGALRM, _alarm)
+
+def _solve(task):
+    index, line = task
+    result = {'index': index}
+    start = time.time()
+    try:
+        key, state = parse_line(line)
+        if key is not None:
+            result['id'] = key
+        if _task_timeout:
+            signal.setitimer(signal.ITIMER_REAL, _task_timeout)
+        try:
+            result['solution'] = _solver(state)
+        finally:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+        result['status'] = 'ok'
+    except _timeout:
+        result['status'] = 'timeout'
+        result['solution'] = None
+    except Exception as e:
+        # a bad scramble must not stop the other tasks
+        result['status'] = 'error'
+        result['error'] = str(e)
+        result['solution'] = None
+    result['time'] = time.time() - start
+    return result
+
+# driver
+
+def _tasks(lines):
+    index = 0
+    for line in lines:
+        if line.strip():
+            yield index, line
+            index = index + 1
+
+def run(lines, output, solver='twophase', processes=None, timeout=None,
+        unordered=False, tables=None):
+    """
+    solves the scrambles of lines, writes the results to output and
+    returns the list of solving times.
+    """
+    if solver == 'twophase':
+        # built once here instead of once per worker
+        twophase.init_tables(tables)
+    pool = multiprocessing.Pool(processes, _init_worker, (solver, timeout, tables))
+    times = []
+    try:
+        if unordered:
+            results = pool.imap_unordered(_solve, _tasks(lines))
+        else:
+            results = pool.imap(_solve, _tasks(lines))
+        for result in results:
+            output.write(json.dumps(result) + "\n")
+            output.flush()
+            times.append(result['time'])
+    finally:
+        pool.terminate()
+        pool.join()
+    return times
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="solve scrambles given as JSON lines")
+    parser.add_argument('-i', '--input', help="input file (default stdin)")
+    parser.add_argument('-o', '--output', help="output file (default stdout)")
+    parser.add_argument('-s', '--solver', choices=sorted(SOLVERS), default='twophase')
+    parser.add_argument('-p', '--processes', type=int, help="number of worker processes")
+    parser.add_argument('-t', '--timeout', type=float, help="seconds per scramble")
+    parser.add_argument('-u', '--unordered', action='store_true',
+                        help="write results in completion order")
+    parser.add_argument('--tables', help="file keeping the two-phase tables")
+    args = parser.parse_args(argv)
+    source = sys.stdin if args.input is None else open(args.input)
+    output = sys.stdout if args.output is None else open(args.output, 'w')
+    start = time.time()
+    try:
+        times = run(source, output, args.solver, args.processes, args.timeout,
+                    args.unordered, args.tables)
+    finally:
+        if args.input is not None:
+            source.close()
+        if args.output is not None:
+            output.close()
+    elapsed = time.time() - start
+    times.sort()
+    if times:
+        sys.stderr.write("%d scrambles in %.3f s, %.2f solves/s, p50 %.3f s, p99 %.3f s\n"
+                         % (len(times), elapsed, len(times)/elapsed,
+                            percentile(times, 50), percentile(times, 99)))
+    else:
+        sys.stderr.write("no scrambles\n")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
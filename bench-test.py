@@ -0,0 +1,31 @@
+import bench
+import problem1
+import unittest
+
+class Test(unittest.TestCase):
+    def test_bench(self):
+        result = bench.bench('sum', lambda: sum(range(100)), 0.01)
+        self.assertEqual('sum', result['name'])
+        self.assertTrue(result['calls'] >= 1)
+        self.assertTrue(result['seconds'] >= 0.01)
+        self.assertTrue(result['ops_per_sec'] > 0)
+        self.assertTrue(result['peak_bytes'] >= 0)
+    def test_scrambles(self):
+        states = bench.scrambles(3, 4)
+        self.assertEqual(states, bench.scrambles(3, 4))
+        for state in states:
+            self.assertTrue(len(problem1.bidirectional_search(state)) <= 3)
+    def test_run_filter(self):
+        results = bench.run('byteperm.__mul__', 0.01)
+        self.assertEqual(['byteperm.__mul__'], [r['name'] for r in results])
+    def test_compare(self):
+        old = [{'name': 'a', 'ops_per_sec': 100.0}, {'name': 'b', 'ops_per_sec': 100.0}]
+        new = [{'name': 'a', 'ops_per_sec': 90.0}, {'name': 'b', 'ops_per_sec': 70.0},
+               {'name': 'c', 'ops_per_sec': 1.0}]
+        self.assertEqual([('b', 100.0, 70.0)], bench.compare(old, new))
+        self.assertEqual(['a', 'b'], [s[0] for s in bench.compare(old, new, 5)])
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
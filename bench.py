@@ -0,0 +1,193 @@
+"""
+Description:
+  benchmarks of the permutation primitives, mathutils and the solvers.
+
+    python bench.py [-o results.json] [--compare old.json] [-k filter]
+
+  every benchmark calls a function repeatedly for at least --min-time
+  seconds and records the calls per second; one more call is made under
+  tracemalloc to record the peak memory it allocates. the solvers are
+  run on fixed sets of scrambles (inverses of seeded random move
+  sequences) of depths 1..--depth, one benchmark per solver and depth.
+
+  the results are written as JSON (to stdout unless -o is given).
+  --compare reads the results of an earlier run and reports every
+  benchmark that got slower by more than --threshold percent; the exit
+  status is 1 if there is such a regression.
+"""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+import base
+import ida
+import mathutils
+import problem1
+from perm import perm, frozenperm, byteperm
+from stabchain import stabchain
+
+def bench(name, func, min_time=0.2):
+    """
+    returns the measurements of calling func() for min_time seconds.
+    """
+    calls = 0
+    batch = 1
+    start = time.perf_counter()
+    while True:
+        for i in range(batch):
+            func()
+        calls = calls + batch
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        batch = batch*2
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'name': name, 'calls': calls, 'seconds': elapsed,
+            'ops_per_sec': calls/elapsed, 'peak_bytes': peak}
+
+def scrambles(depth, count, seed=1):
+    """
+    returns count states (seeded) solved by depth random base.B moves,
+    so the solutions have at most depth moves.
+    """
+    rng = random.Random(seed*1000 + depth)
+    states = []
+    for i in range(count):
+        state = base.b0.Identity()
+        moves = []
+        while len(moves) < depth:
+            j = rng.randrange(len(base.B))
+            if moves[-3:] == [j, j, j]:
+                continue
+            moves.append(j)
+            state = base.B[j]*state
+        states.append(state.Inverse().Freeze())
+    return states
+
+# benchmarks
+
+def _perm_benchmarks():
+    rng = random.Random(1)
+    group = stabchain(base.B)
+    images = [group.Random(rng) for i in range(2)]
+    image = [images[0][i] for i in range(base.N+1)]
+    x, y = [perm.from_image([p[i] for i in range(base.N+1)]) for p in images]
+    fx, fy = [byteperm.from_image([p[i] for i in range(base.N+1)]) for p in images]
+    cycles = x.Cycles()
+    return [
+        ('perm.__mul__', lambda: x*y),
+        ('byteperm.__mul__', lambda: fx*fy),
+        ('perm.Inverse', lambda: x.Inverse()),
+        ('byteperm.Inverse', lambda: fx.Inverse()),
+        ('perm.Cycles', lambda: x.Cycles()),
+        ('perm.Order', lambda: x.Order()),
+        ('perm.IntPow', lambda: x.IntPow(1000003)),
+        ('perm.__eq__', lambda: x == y),
+        ('byteperm.__eq__', lambda: fx == fy),
+        ('perm(cycles)', lambda: perm(*cycles)),
+        ('perm.from_image', lambda: perm.from_image(image)),
+        ('frozenperm.from_image', lambda: frozenperm.from_image(image)),
+        ('frozenperm.Order', lambda: frozenperm.from_image(image).Order()),
+    ]
+
+def _mathutils_benchmarks():
+    rng = random.Random(1)
+    pairs = [(rng.randrange(10**5, 10**6), rng.randrange(10**5, 10**6)) for i in range(100)]
+    numbers = list(range(1, 201))
+    return [
+        ('mathutils.gcd', lambda: [mathutils.gcd(a, b) for a, b in pairs]),
+        ('mathutils.lcm', lambda: [mathutils.lcm(a, b) for a, b in pairs]),
+        ('mathutils.lcm(1..200)', lambda: mathutils.lcm(numbers)),
+    ]
+
+SOLVERS = {'breath': problem1.breath_search,
+           'bidirectional': problem1.bidirectional_search,
+           'ida': ida.ida_search}
+
+def _solver_benchmarks(depth, count, solvers):
+    result = []
+    for name in solvers:
+        solver = SOLVERS[name]
+        for d in range(1, depth+1):
+            states = scrambles(d, count)
+            result.append(('%s depth %d' % (name, d),
+                           lambda solver=solver, states=states: [solver(s) for s in states]))
+    return result
+
+def run(pattern=None, min_time=0.2, depth=4, count=5, solvers=('breath', 'bidirectional', 'ida')):
+    """
+    returns the list of measurements of the benchmarks whose name
+    contains pattern.
+    """
+    benchmarks = _perm_benchmarks() + _mathutils_benchmarks() + \
+                 _solver_benchmarks(depth, count, solvers)
+    results = []
+    for name, func in benchmarks:
+        if pattern is None or pattern in name:
+            results.append(bench(name, func, min_time))
+    return results
+
+def compare(old, new, threshold=20.0):
+    """
+    returns the list of (name, old ops/sec, new ops/sec) of benchmarks
+    of new that are more than threshold percent slower than in old.
+    """
+    previous = dict([(r['name'], r['ops_per_sec']) for r in old])
+    slower = []
+    for r in new:
+        before = previous.get(r['name'])
+        if before is not None and r['ops_per_sec'] < before*(1 - threshold/100.0):
+            slower.append((r['name'], before, r['ops_per_sec']))
+    return slower
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="benchmark perm primitives and solvers")
+    parser.add_argument('-o', '--output', help="JSON output file (default stdout)")
+    parser.add_argument('-k', '--filter', help="run benchmarks whose name contains this")
+    parser.add_argument('--min-time', type=float, default=0.2, help="seconds per benchmark")
+    parser.add_argument('--depth', type=int, default=4, help="largest scramble depth")
+    parser.add_argument('--count', type=int, default=5, help="scrambles per depth")
+    parser.add_argument('--solvers', default='breath,bidirectional,ida',
+                        help="comma separated list of %s" % ','.join(sorted(SOLVERS)))
+    parser.add_argument('--compare', help="JSON results of an earlier run")
+    parser.add_argument('--threshold', type=float, default=20.0,
+                        help="percent slowdown reported as regression")
+    args = parser.parse_args(argv)
+    solvers = [s for s in args.solvers.split(',') if s]
+    results = run(args.filter, args.min_time, args.depth, args.count, solvers)
+    data = {'python': platform.python_version(), 'machine': platform.machine(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': results}
+    text = json.dumps(data, indent=1)
+    if args.output is None:
+        sys.stdout.write(text + "\n")
+    else:
+        f = open(args.output, 'w')
+        try:
+            f.write(text + "\n")
+        finally:
+            f.close()
+    if args.compare is not None:
+        f = open(args.compare)
+        try:
+            old = json.load(f)['results']
+        finally:
+            f.close()
+        slower = compare(old, results, args.threshold)
+        for name, before, after in slower:
+            sys.stderr.write("regression: %s %.1f -> %.1f ops/s\n" % (name, before, after))
+        if slower:
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
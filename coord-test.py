@@ -0,0 +1,48 @@
+import base
+import coord
+import cubie
+from perm import perm, rank_images
+import random
+import unittest
+
+class Test(unittest.TestCase):
+    def test_ranks(self):
+        for r in (0, 100, 40319):
+            self.assertEqual(r, coord.perm_rank(coord.perm_unrank(r, 8)))
+        p = perm.from_image([0, 3, 1, 4, 2, 8, 5, 7, 6], validate=False)
+        self.assertEqual(p.Rank(), coord.perm_rank([2, 0, 3, 1, 7, 4, 6, 5]))
+    def test_orientations(self):
+        for r in (0, 17, coord.SIZES['twist']-1):
+            self.assertEqual(r, coord.twist(coord.twist_orientations(r)))
+        for r in (0, 17, coord.SIZES['flip']-1):
+            self.assertEqual(r, coord.flip(coord.flip_orientations(r)))
+    def test_solved(self):
+        c = coord.coordinates(base.b0.Identity())
+        self.assertEqual(0, c['twist'])
+        self.assertEqual(0, c['flip'])
+        self.assertEqual(0, c['corners'])
+        self.assertEqual(rank_images([0,1,2,3], 12), c['edges_u'])
+    def test_move_tables_follow_moves(self):
+        rng = random.Random(6)
+        state = base.b0.Identity()
+        c = coord.coordinates(state)
+        for i in range(20):
+            m = rng.randrange(coord.NMOVES)
+            for k in range(m%3+1):
+                state = base.B[m//3]*state
+            expected = coord.coordinates(state)
+            for name in ('twist', 'flip', 'edges_u', 'edges_d', 'edges_e'):
+                c[name] = coord.move_table(name)[m][c[name]]
+                self.assertEqual(expected[name], c[name])
+    def test_corners_move_table(self):
+        state = base.b4*base.b1*base.b2
+        c = coord.coordinates(state)['corners']
+        table = coord.move_table('corners')
+        self.assertEqual(coord.coordinates(base.b3*state)['corners'], table[9][c])
+    def test_edge_perm(self):
+        self.assertEqual(0, coord.edge_perm(cubie.from_perm(base.b0.Identity())[2]))
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
@@ -0,0 +1,183 @@
+"""
+Description:
+  coordinates of cube states and their move tables.
+
+  a coordinate is a small integer describing one aspect of the cubie
+  state of cubie.py. for each coordinate a move table gives the
+  coordinate after a move, next = move_table(name)[move][coord], so a
+  search can follow a coordinate through the moves by lookups instead
+  of composing 55 point permutations.
+
+    name      describes                               values
+    twist     corner orientations (CO)                3^7 = 2187
+    flip      edge orientations (EO)                  2^11 = 2048
+    corners   corner permutation (CP)                 8! = 40320
+    edges_u   positions of the U layer edges 0..3     12!/8! = 11880
+    edges_d   positions of the D layer edges 4..7     11880
+    edges_e   positions of the middle edges 8..11     11880
+
+  the edge permutation (EP) has 12! values, far too many for a move
+  table; it is determined by edges_u, edges_d and edges_e, which are
+  followed separately (see edge_perm for its rank).
+
+  moves are numbered as in ida.MOVES, move m turns face m//3 by m%3+1
+  quarter turns. the tables are built on first use.
+
+Data:
+  NMOVES ... number of moves
+  CORNER_MOVES, EDGE_MOVES ... for every move m and position j the pair
+      (k, t): the cubie at position k goes to position j and gains t in
+      orientation (cubie.CORNER_MOVES for all powers)
+"""
+from array import array
+import base
+import cubie
+from perm import rank_images, unrank_images
+
+NMOVES = 3*len(base.B)
+
+def _power(moves, k, n):
+    # cubie moves (src, twist) of k quarter turns
+    result = [(j, 0) for j in range(len(moves))]
+    for i in range(k):
+        result = [(moves[s][0], (moves[s][1]+t) % n) for s, t in result]
+    return result
+
+CORNER_MOVES = [_power(cubie.CORNER_MOVES[m//3], m%3+1, 3) for m in range(NMOVES)]
+EDGE_MOVES = [_power(cubie.EDGE_MOVES[m//3], m%3+1, 2) for m in range(NMOVES)]
+
+def _destinations(moves):
+    dest = [0]*len(moves)
+    for j in range(len(moves)):
+        dest[moves[j][0]] = j
+    return dest
+
+# move m takes the edge at position k to position EDGE_DESTINATIONS[m][k]
+EDGE_DESTINATIONS = [_destinations(moves) for moves in EDGE_MOVES]
+
+# ranks
+
+def perm_rank(p):
+    """
+    returns the rank of a permutation of range(len(p)), the same as
+    perm.Rank of its image list on the points 1..len(p).
+    """
+    n = len(p)
+    return rank_images([n-1-p[i] for i in range(n-1, -1, -1)], n)
+
+def perm_unrank(r, n):
+    """
+    returns the permutation of range(n) with rank r (see perm_rank).
+    """
+    x = unrank_images(r, n, n)
+    return [n-1-x[i] for i in range(n-1, -1, -1)]
+
+# coordinates
+
+def twist(co):
+    r = 0
+    for j in range(7):
+        r = 3*r + co[j]
+    return r
+
+def twist_orientations(r):
+    co = [0]*8
+    for j in range(6, -1, -1):
+        co[j] = r % 3
+        r = r//3
+    co[7] = -sum(co) % 3
+    return co
+
+def flip(eo):
+    r = 0
+    for j in range(11):
+        r = 2*r + eo[j]
+    return r
+
+def flip_orientations(r):
+    eo = [0]*12
+    for j in range(10, -1, -1):
+        eo[j] = r % 2
+        r = r//2
+    eo[11] = sum(eo) % 2
+    return eo
+
+def edge_positions(ep, first):
+    """
+    returns the positions of the edges first..first+3.
+    """
+    positions = [0]*4
+    for j in range(12):
+        if first <= ep[j] < first+4:
+            positions[ep[j]-first] = j
+    return positions
+
+def edge_perm(ep):
+    """
+    returns the rank of the edge permutation ep among all 12!.
+    """
+    return perm_rank(ep)
+
+EDGE_GROUPS = {'edges_u': 0, 'edges_d': 4, 'edges_e': 8}
+
+SIZES = {'twist': 3**7, 'flip': 2**11, 'corners': 40320,
+         'edges_u': 11880, 'edges_d': 11880, 'edges_e': 11880}
+
+def coordinates(state):
+    """
+    returns a dictionary of all coordinates of state (a permutation),
+    or None if state does not describe corners and edges.
+    """
+    cubies = cubie.from_perm(state)
+    if cubies is None:
+        return None
+    cp, co, ep, eo = cubies
+    result = {'twist': twist(co), 'flip': flip(eo), 'corners': perm_rank(cp)}
+    for name in EDGE_GROUPS:
+        result[name] = rank_images(edge_positions(ep, EDGE_GROUPS[name]), 12)
+    return result
+
+# move tables
+
+def _twist_row(r):
+    co = twist_orientations(r)
+    return [twist([(co[k]+t) % 3 for k, t in CORNER_MOVES[m]]) for m in range(NMOVES)]
+
+def _flip_row(r):
+    eo = flip_orientations(r)
+    return [flip([(eo[k]+t) % 2 for k, t in EDGE_MOVES[m]]) for m in range(NMOVES)]
+
+def _corners_row(r):
+    cp = perm_unrank(r, 8)
+    return [perm_rank([cp[k] for k, t in CORNER_MOVES[m]]) for m in range(NMOVES)]
+
+def _edges_row(r):
+    positions = unrank_images(r, 4, 12)
+    return [rank_images([EDGE_DESTINATIONS[m][j] for j in positions], 12)
+            for m in range(NMOVES)]
+
+_ROWS = {'twist': _twist_row, 'flip': _flip_row, 'corners': _corners_row,
+         'edges_u': _edges_row, 'edges_d': _edges_row, 'edges_e': _edges_row}
+
+_tables = {}
+
+def move_table(name):
+    """
+    returns the move table of coordinate name, a list of one array per
+    move indexed by the coordinate.
+    """
+    if name not in _tables:
+        if name in ('edges_d', 'edges_e'):
+            # the tables only depend on positions, not on the edges
+            _tables[name] = move_table('edges_u')
+        else:
+            table = [array('L', [0]*SIZES[name]) for m in range(NMOVES)]
+            row = _ROWS[name]
+            for r in range(SIZES[name]):
+                values = row(r)
+                for m in range(NMOVES):
+                    table[m][r] = values[m]
+            _tables[name] = table
+    return _tables[name]
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
@@ -0,0 +1,33 @@
+import base
+import cubie
+from perm import perm
+import random
+import unittest
+
+class Test(unittest.TestCase):
+    def test_facelets(self):
+        facelets = [f for c in cubie.CORNERS for f in c] + [f for e in cubie.EDGES for f in e]
+        self.assertEqual(list(range(1, base.N+1)), sorted(facelets + base.fixed_points))
+    def test_solved(self):
+        self.assertEqual((list(range(8)), [0]*8, list(range(12)), [0]*12),
+                         cubie.from_perm(base.b0.Identity()))
+    def test_moves_match_facelets(self):
+        rng = random.Random(3)
+        state = base.b0.Identity()
+        cubies = cubie.from_perm(state)
+        for i in range(30):
+            b = rng.randrange(len(base.B))
+            state = base.B[b]*state
+            cubies = cubie.apply_move(b, *cubies)
+            self.assertEqual(cubie.from_perm(state), cubies)
+            self.assertEqual(state, cubie.to_perm(*cubies))
+        self.assertEqual(0, sum(cubies[1]) % 3)
+        self.assertEqual(0, sum(cubies[3]) % 2)
+    def test_invalid_state(self):
+        self.assertEqual(None, cubie.from_perm(perm(1,2)))
+        self.assertEqual(None, cubie.from_perm(perm(1,10)))
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
@@ -0,0 +1,101 @@
+"""
+Description:
+  cubie level view of the facelet model in base.py.
+
+  the 8 corners and 12 edges are given by their facelets in the net of
+  base.py, the first facelet of each is its reference facelet (the U or
+  D facelet, for the 4 middle layer edges the F or B facelet) and the
+  corner facelets are listed in the same rotational sense for all
+  corners.
+
+  a state s (a permutation, solved state = identity, a move b turns
+  it into b*s) is described by the cubie sitting at each position and
+  its orientation: cp[j] = c and co[j] = t if facelet t of corner c is
+  at the reference facelet of corner position j, i.e.
+  s[CORNERS[j][0]] == CORNERS[c][t]. ep and eo are the same for edges.
+
+Data:
+  CORNERS ... facelet triples of URF, UFL, ULB, UBR, DFR, DLF, DBL, DRB
+  EDGES ... facelet pairs of UR, UF, UL, UB, DR, DF, DL, DB, FR, FL, BL, BR
+  CORNER_MOVES, EDGE_MOVES ... for every base permutation and every
+      position j the pair (k, t): the cubie at position k goes to
+      position j and gains t in orientation
+"""
+import base
+from perm import frozenperm
+
+CORNERS = [(9,28,21),(7,19,12),(1,10,52),(3,54,30),
+           (39,27,34),(37,18,25),(43,46,16),(45,36,48)]
+EDGES = [(6,29),(8,20),(4,11),(2,53),(42,35),(38,26),
+         (40,17),(44,47),(24,31),(22,15),(49,13),(51,33)]
+
+def _lookup(cubies):
+    facelets = {}
+    for c in range(len(cubies)):
+        for t in range(len(cubies[c])):
+            facelets[cubies[c][t]] = (c, t)
+    return facelets
+
+CORNER_FACELETS = _lookup(CORNERS)
+EDGE_FACELETS = _lookup(EDGES)
+
+def _moves(b, cubies, facelets):
+    n = len(cubies[0])
+    moves = []
+    for j in range(len(cubies)):
+        k, t = facelets[b[cubies[j][0]]]
+        for u in range(n):
+            if b[cubies[j][u]] != cubies[k][(t+u) % n]:
+                raise ValueError("cubie: facelets of cubie %d are not ordered consistently" % j)
+        moves.append((k, t))
+    return moves
+
+CORNER_MOVES = [_moves(b, CORNERS, CORNER_FACELETS) for b in base.B]
+EDGE_MOVES = [_moves(b, EDGES, EDGE_FACELETS) for b in base.B]
+
+def from_perm(state):
+    """
+    returns (cp, co, ep, eo) of state, or None if state does not
+    describe corners and edges.
+    """
+    result = []
+    for cubies, facelets in ((CORNERS, CORNER_FACELETS), (EDGES, EDGE_FACELETS)):
+        n = len(cubies[0])
+        p = []
+        o = []
+        for j in range(len(cubies)):
+            c, t = facelets.get(state[cubies[j][0]], (None, 0))
+            if c is None or len(cubies[c]) != n:
+                return None
+            for u in range(1, n):
+                if state[cubies[j][u]] != cubies[c][(t+u) % n]:
+                    return None
+            p.append(c)
+            o.append(t)
+        result.append(p)
+        result.append(o)
+    return tuple(result)
+
+def to_perm(cp, co, ep, eo):
+    """
+    returns the state with the given cubie description.
+    """
+    image = [i for i in range(base.N+1)]
+    for cubies, p, o in ((CORNERS, cp, co), (EDGES, ep, eo)):
+        n = len(cubies[0])
+        for j in range(len(cubies)):
+            for u in range(n):
+                image[cubies[j][u]] = cubies[p[j]][(o[j]+u) % n]
+    return frozenperm.from_image(image, validate=False)
+
+def apply_move(b, cp, co, ep, eo):
+    """
+    returns the cubie description of base.B[b]*state for the state
+    described by cp, co, ep, eo.
+    """
+    cm = CORNER_MOVES[b]
+    em = EDGE_MOVES[b]
+    return ([cp[k] for k, t in cm], [(co[k]+t) % 3 for k, t in cm],
+            [ep[k] for k, t in em], [(eo[k]+t) % 2 for k, t in em])
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
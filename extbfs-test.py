@@ -0,0 +1,72 @@
+import base
+import extbfs
+import os
+import shutil
+import tempfile
+import unittest
+from perm import image_bytes
+
+def level_sizes(gens, max_depth):
+    # in-memory breadth first search
+    start = base.b0.Identity().Freeze()
+    seen = set([start])
+    level = [start]
+    sizes = [1]
+    for d in range(max_depth):
+        next_level = []
+        for x in level:
+            for g in gens:
+                y = g*x
+                if y not in seen:
+                    seen.add(y)
+                    next_level.append(y)
+        level = next_level
+        sizes.append(len(level))
+    return sizes
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+    def test_window(self):
+        self.assertEqual(4, extbfs.extbfs._Window(base.B))
+        self.assertEqual(2, extbfs.extbfs._Window([base.b0, base.b0.Inverse()]))
+    def test_full_sweep(self):
+        sizes = extbfs.extbfs(self.directory, [base.b0, base.b1]).Run()
+        self.assertEqual(16, sum(sizes))
+        self.assertEqual(0, sizes[-1])
+        self.assertEqual(level_sizes([base.b0, base.b1], len(sizes)-1), sizes)
+    def test_levels_match_memory_search(self):
+        gens = [base.b0, base.b2]
+        sweep = extbfs.extbfs(self.directory, gens, buffer_records=50)
+        sizes = sweep.Run(max_depth=6)
+        self.assertEqual(level_sizes(gens, 6), sizes)
+        states = list(sweep.Level(2))
+        self.assertEqual(sizes[2], len(states))
+        self.assertTrue((base.b2*base.b0).Freeze() in states)
+        data = [image_bytes(x, extbfs.W) for x in states]
+        self.assertEqual(sorted(set(data)), data)
+    def test_resume(self):
+        gens = [base.b0, base.b2]
+        expected = level_sizes(gens, 5)
+        self.assertEqual(expected[:4], extbfs.extbfs(self.directory, gens).Run(max_depth=3))
+        # leftovers of a crash while computing level 4
+        for name in ("run-004-0000.bin", "level-004.bin.tmp"):
+            f = open(os.path.join(self.directory, name), "wb")
+            f.write(b"garbage")
+            f.close()
+        calls = []
+        sweep = extbfs.extbfs(self.directory, gens, buffer_records=100)
+        self.assertEqual(expected, sweep.Run(max_depth=5, callback=lambda d, n: calls.append(d)))
+        self.assertEqual([4, 5], calls)
+        self.assertEqual(sorted(["checkpoint.json"] + ["level-%03d.bin" % d for d in range(6)]),
+                         sorted(os.listdir(self.directory)))
+    def test_other_generators(self):
+        extbfs.extbfs(self.directory, [base.b0, base.b1]).Run(max_depth=1)
+        self.assertRaises(ValueError, extbfs.extbfs(self.directory, [base.b0]).Run)
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
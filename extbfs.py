@@ -0,0 +1,230 @@
+"""
+File    extbfs.py
+
+Description
+    External-memory breadth first enumeration of the states reachable
+    by a list of generators, for sweeps whose state sets do not fit in
+    memory.
+
+    States use the encoding of problem1.breath_search: the images of
+    the points 0..base.N as bytes (W = base.N+1 bytes per state), and
+    a move b takes state x to b*x. Every level is a file of sorted,
+    distinct fixed-width records in the working directory. Level d+1 is
+    made by reading level d in order and generating the successors into
+    a buffer of at most buffer_records states; every full buffer is
+    sorted and written as a run file. The runs are then merged (heapq),
+    duplicates are dropped while merging, and so are the states already
+    in one of the previous levels. For generators closed under inverses
+    these are levels d and d-1; in general x is at most order(b)-1
+    levels above b*x, so for base.B (b^-1 = b^3) levels d-3 .. d.
+
+    Files are written under temporary names and renamed when complete,
+    and a checkpoint file records the finished levels, so a sweep that
+    was interrupted continues with the first unfinished level when it
+    is run again in the same directory.
+
+    level-DDD.bin     sorted records of level DDD
+    run-DDD-RRRR.bin  sorted runs of the level in progress
+    checkpoint.json   start, generators and sizes of the finished levels
+
+Example
+    >>> sweep = extbfs("/scratch/sweep", [base.b0, base.b2])
+    >>> sweep.Run()                          # sizes of all levels
+    >>> for state in sweep.Level(3): ...
+"""
+import heapq
+import json
+import os
+import base
+from perm import byteperm, IDENTITY_BYTES, image_bytes
+
+W = base.N+1
+
+_BLOCK = 4096
+
+CHECKPOINT = "checkpoint.json"
+
+
+def _records(filename):
+    # iterates over the records of a file
+    f = open(filename, "rb")
+    try:
+        while True:
+            block = f.read(W*_BLOCK)
+            if not block:
+                break
+            for i in range(0, len(block), W):
+                yield block[i:i+W]
+    finally:
+        f.close()
+
+def _unique(records):
+    last = None
+    for x in records:
+        if x != last:
+            yield x
+            last = x
+
+def _subtract(records, other):
+    # records of the sorted iterator records not in the sorted iterator other
+    y = next(other, None)
+    for x in records:
+        while y is not None and y < x:
+            y = next(other, None)
+        if x != y:
+            yield x
+
+def _write(filename, records):
+    # writes records to filename atomically, returns their number
+    tmp = filename + ".tmp"
+    f = open(tmp, "wb")
+    n = 0
+    try:
+        buf = []
+        for x in records:
+            buf.append(x)
+            if len(buf) == _BLOCK:
+                f.write(b"".join(buf))
+                n = n + len(buf)
+                buf = []
+        f.write(b"".join(buf))
+        n = n + len(buf)
+        f.flush()
+        os.fsync(f.fileno())
+    finally:
+        f.close()
+    os.replace(tmp, filename)
+    return n
+
+
+class extbfs:
+    """
+    Disk-backed breadth first search over the states reachable from a
+    start state.
+    """
+
+    def __init__(self, directory, gens=None, start=None, buffer_records=2**20):
+        """
+        directory      - working directory of the level files
+        gens           - generators, default base.B
+        start          - start state, default the identity
+        buffer_records - states sorted in memory at once
+        """
+        if gens is None:
+            gens = base.B
+        self.directory = directory
+        self.gens      = [image_bytes(g, W) for g in gens]
+        self.start     = IDENTITY_BYTES[:W] if start is None else image_bytes(start, W)
+        self.buffer_records = buffer_records
+        self.window    = self._Window(gens)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    @staticmethod
+    def _Window(gens):
+        # number of previous levels a new state can be in
+        frozen = set([g.Freeze() for g in gens])
+        if all([g.Inverse() in frozen for g in gens]):
+            return 2
+        return max([g.Order() for g in gens])
+
+    def _Path(self, name):
+        return os.path.join(self.directory, name)
+
+    def LevelFile(self, depth):
+        return self._Path("level-%03d.bin" % depth)
+
+    def Level(self, depth):
+        """
+        Returns an iterator over the states of level depth as byteperms.
+        """
+        for x in _records(self.LevelFile(depth)):
+            yield byteperm.from_image(x, validate=False)
+
+    def _Checkpoint(self):
+        # the sizes of the finished levels, or None
+        filename = self._Path(CHECKPOINT)
+        if not os.path.exists(filename):
+            return None
+        f = open(filename)
+        try:
+            data = json.load(f)
+        finally:
+            f.close()
+        if data['start'] != list(self.start) or data['gens'] != [list(g) for g in self.gens]:
+            raise ValueError("extbfs: %s holds a sweep of other generators" % self.directory)
+        return data['sizes']
+
+    def _SaveCheckpoint(self, sizes):
+        filename = self._Path(CHECKPOINT)
+        f = open(filename + ".tmp", "w")
+        try:
+            json.dump({'start': list(self.start), 'gens': [list(g) for g in self.gens],
+                       'sizes': sizes}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        finally:
+            f.close()
+        os.replace(filename + ".tmp", filename)
+
+    def _Runs(self, depth):
+        # generates the successors of level depth into sorted run files
+        pad = IDENTITY_BYTES[W:]
+        runs = []
+        buf = []
+        for x in _records(self.LevelFile(depth)):
+            table = x + pad
+            for g in self.gens:
+                buf.append(g.translate(table))
+            if len(buf) >= self.buffer_records:
+                runs.append(self._Run(depth, len(runs), buf))
+                buf = []
+        if buf or not runs:
+            runs.append(self._Run(depth, len(runs), buf))
+        return runs
+
+    def _Run(self, depth, number, buf):
+        buf.sort()
+        filename = self._Path("run-%03d-%04d.bin" % (depth+1, number))
+        _write(filename, _unique(buf))
+        return filename
+
+    def _Cleanup(self, depth):
+        # removes files of unfinished levels beyond depth
+        for name in os.listdir(self.directory):
+            if name.startswith("run-") or name.endswith(".tmp"):
+                os.remove(self._Path(name))
+            elif name.startswith("level-") and int(name[6:9]) > depth:
+                os.remove(self._Path(name))
+
+    def Run(self, max_depth=None, callback=None):
+        """
+        max_depth - last level to compute, default all
+        callback  - called with (depth, size) after every level
+
+        Computes (or continues) the sweep and returns the list of the
+        sizes of the levels.
+        """
+        sizes = self._Checkpoint()
+        if sizes is None:
+            self._Cleanup(-1)
+            sizes = [_write(self.LevelFile(0), [self.start])]
+            self._SaveCheckpoint(sizes)
+        else:
+            self._Cleanup(len(sizes)-1)
+        while sizes[-1] > 0 and (max_depth is None or len(sizes) <= max_depth):
+            depth = len(sizes)-1
+            runs = self._Runs(depth)
+            merged = _unique(heapq.merge(*[_records(run) for run in runs]))
+            previous = [_records(self.LevelFile(d))
+                        for d in range(max(0, depth-self.window+1), depth+1)]
+            new = _subtract(merged, heapq.merge(*previous))
+            sizes.append(_write(self.LevelFile(depth+1), new))
+            for run in runs:
+                os.remove(run)
+            self._SaveCheckpoint(sizes)
+            if callback is not None:
+                callback(depth+1, sizes[-1])
+        return sizes
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
@@ -0,0 +1,40 @@
+import base
+import ida
+import patterndb
+import os
+import tempfile
+import unittest
+
+class Test(unittest.TestCase):
+    def test_generators(self):
+        self.assertEqual(18, len(ida.GENERATORS))
+        self.assertEqual(base.b2.Inverse(), ida.GENERATORS[8])
+    def test_identity(self):
+        self.assertEqual([], ida.ida_search(base.b0.Identity()))
+    def test_half_turn(self):
+        self.assertEqual([3,3], ida.ida_search(base.b3*base.b3))
+    def test_inverse_turn(self):
+        self.assertEqual([4], ida.ida_search(base.b4.Inverse()))
+    def test_solution_is_optimal(self):
+        a = (base.b0*base.b5*base.b3*base.b3*base.b1).Inverse()
+        moves = ida.ida_search(a)
+        self.assertTrue(base.apply_moves(a, moves).IsIdentity())
+        self.assertEqual(5, len(moves))
+    def test_max_depth(self):
+        self.assertEqual(None, ida.ida_search(base.b0*base.b2, max_depth=1))
+    def test_pattern_database_heuristic(self):
+        fd, filename = tempfile.mkstemp(suffix=".pdb")
+        os.close(fd)
+        try:
+            db = patterndb.Build(filename, [1,3], ida.GENERATORS)
+            a = (base.b0*base.b2*base.b5*base.b1).Inverse()
+            moves = ida.ida_search(a, db)
+            self.assertEqual(ida.ida_search(a), moves)
+            db.Close()
+        finally:
+            os.remove(filename)
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
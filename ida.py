@@ -0,0 +1,115 @@
+"""
+Description:
+  iterative deepening A* search for an optimal solution of a cube state.
+
+  the search turns every face of base.B by a quarter, half or three
+  quarter turn, each counting as one move, and keeps only the current
+  path in memory. redundant sequences are never generated: a face is
+  not turned twice in a row, and of two consecutive turns of opposite
+  faces (which commute) only the order with the smaller index first is
+  tried.
+
+  the heuristic is any function mapping a state to a lower bound of the
+  number of moves needed, e.g. a pattern database built with GENERATORS
+  (see patterndb.py). the solution is returned in the format of
+  problem1.breath_search, a list of indices into base.B, so a half turn
+  of face i appears as [i,i] and a three quarter turn as [i,i,i].
+
+  with a searchstats object as stats, ida_search records the nodes of
+  every iteration (as the frontier) and the time of every bound. every
+  node is generated; the nodes cut off by the bound are not expanded,
+  and those cut off only by a bound from the table count as duplicates.
+
+  with a transtable.transtable as table, the search stores the lower
+  bounds it learns for the states of failed subtrees and uses them on
+  later visits of the same states, in the same or later iterations.
+"""
+import time
+import base
+
+# (face, number of quarter turns, permutation)
+MOVES = [(face, power, base.B[face].IntPow(power))
+         for face in range(len(base.B)) for power in range(1, 4)]
+
+GENERATORS = [move[2] for move in MOVES]
+
+def zero_heuristic(state):
+    return 0
+
+def _allowed(face, last):
+    if last < 0:
+        return True
+    if face == last:
+        return False
+    return not (base.opposite[face] == last and face < last)
+
+def _search(state, depth, bound, last, path, heuristic, table=None, counts=None):
+    # returns True if a solution was found (path holds it), otherwise
+    # the smallest cost exceeding bound seen below this node; counts,
+    # if given, is [generated, expanded, duplicates]
+    h = heuristic(state)
+    if counts is not None:
+        counts[0] += 1
+    if table is not None:
+        # the moves tried depend on last, so it is part of the key
+        key = hash(state)*7 + last
+        stored = table.Lookup(key)
+        if counts is not None and depth+h <= bound < depth+stored:
+            # cut off only by the bound learned on an earlier visit
+            counts[2] += 1
+        h = max(h, stored)
+    cost = depth + h
+    if cost > bound:
+        return cost
+    if state.IsIdentity():
+        return True
+    if counts is not None:
+        counts[1] += 1
+    minimum = None
+    for face, power, p in MOVES:
+        if not _allowed(face, last):
+            continue
+        path.append((face, power))
+        t = _search(p*state, depth+1, bound, face, path, heuristic, table, counts)
+        if t is True:
+            return True
+        path.pop()
+        if minimum is None or t < minimum:
+            minimum = t
+    if table is not None:
+        table.Store(key, minimum - depth)
+    return minimum
+
+def expand(path):
+    moves = []
+    for face, power in path:
+        moves.extend([face]*power)
+    return moves
+
+def ida_search(a, heuristic=zero_heuristic, max_depth=20, stats=None, table=None):
+    bound = heuristic(a)
+    path = []
+    counts = None
+    if stats is not None:
+        counts = [0, 0, 0]
+    while bound <= max_depth:
+        if stats is not None:
+            start = time.time()
+            generated, expanded, duplicates = counts
+        t = _search(a, 0, bound, -1, path, heuristic, table, counts)
+        if stats is not None:
+            stats.AddTime('bound %d' % bound, time.time()-start)
+            stats.generated += counts[0]-generated
+            stats.expanded += counts[1]-expanded
+            stats.duplicates += counts[2]-duplicates
+            stats.Store(bound+1)
+            stats.Level(counts[0]-generated)
+        if t is True:
+            return expand(path)
+        bound = t
+    return None
+
+if __name__ == '__main__':
+    print(ida_search((base.b0*base.b5*base.b3*base.b3*base.b1).Inverse()))
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
@@ -23,6 +23,11 @@ class Test(unittest.TestCase):
     def test_lcm_handles_list(self):
         self.assertEqual(6, mathutils.lcm([6]))
         self.assertEqual(2*3*5, mathutils.lcm([2*3, -3, 3*5]))
+    def test_large_inputs(self):
+        self.assertEqual(1, mathutils.gcd(2**89-1, 3))
+        self.assertEqual(2**40, mathutils.gcd(2**40*3**20, 2**50*5))
+        self.assertEqual(232792560, mathutils.lcm(list(range(1, 21))))
+        self.assertEqual(1, mathutils.gcd(list(range(1, 1000))))
     def test_lcm_type_is_int(self):
         self.assertEqual(int, type(mathutils.lcm([6])))
         self.assertEqual(int, type(mathutils.lcm([2*3, -3, 3*5])))
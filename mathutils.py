@@ -8,8 +8,10 @@ def lcm(a,b=None):
             return 0
         elif len(a) == 1:
             return a[0]
-        else:
-            return lcm(a[0],lcm(a[1:]))
+        result = a[0]
+        for x in a[1:]:
+            result = lcm(result,x)
+        return result
     if a == 0 or b == 0:
         return 0
     else:
@@ -24,15 +26,14 @@ def gcd(a,b=None):
             return 0
         elif len(a) == 1:
             return abs(a[0])
-        else:
-            return gcd(gcd(a[0],a[1]), gcd(a[2:]))
+        result = abs(a[0])
+        for x in a[1:]:
+            result = gcd(result,x)
+        return result
     if a < 0: a = -a
-    if b < 0: b = -b 
-    while True:
-        if b > a:
-            a, b = b, a
-        if b == 0:
-            return a
-        a -= b
+    if b < 0: b = -b
+    while b != 0:
+        a, b = b, a % b
+    return a
 
 # vim:expandtab:softtabstop=4:shiftwidth=4
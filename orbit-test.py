@@ -0,0 +1,91 @@
+import base
+import ida
+import patterndb
+import unittest
+from perm import perm
+from orbit import orbit as Orbit
+
+def apply_word(seed, word, action):
+    x = seed
+    for j in word:
+        g = base.B[j]
+        if action == 'point':
+            x = g[x]
+        elif action == 'tuple':
+            x = tuple([g[p] for p in x])
+        else:
+            x = frozenset([g[p] for p in x])
+    return x
+
+class Test(unittest.TestCase):
+    def test_fixed_points(self):
+        for p in base.fixed_points:
+            self.assertEqual([p], list(Orbit(p)))
+        self.assertEqual(1, len(Orbit(set(base.fixed_points))))
+        self.assertEqual(1, len(Orbit(tuple(base.fixed_points))))
+    def test_point_orbits(self):
+        corners = Orbit(1)
+        edges = Orbit(2)
+        self.assertEqual(24, len(corners))
+        self.assertEqual(24, len(edges))
+        self.assertEqual(patterndb.Orbit([1], base.B), sorted(corners))
+        self.assertEqual(54, len(corners) + len(edges) + len(base.fixed_points))
+        self.assertTrue(28 in corners)
+        self.assertFalse(2 in corners)
+    def test_tuples_and_sets(self):
+        pairs = Orbit((1, 3))
+        self.assertEqual(24*21, len(pairs))
+        self.assertEqual(24*21//2, len(Orbit(set([1, 3]))))
+        self.assertEqual(len(pairs), len(Orbit([1, 3], ida.GENERATORS)))
+        self.assertEqual('tuple', pairs.action)
+        self.assertEqual(24, len(Orbit([1], action='tuple')))
+        self.assertRaises(ValueError, Orbit, 1, None, 'list')
+    def test_words(self):
+        for seed in (1, (2, 4), frozenset([1, 7, 9])):
+            o = Orbit(seed)
+            for x in list(o)[::7]:
+                word = o.Word(x)
+                self.assertEqual(x, apply_word(o.seed, word, o.action))
+            self.assertEqual([], o.Word(o.seed))
+        self.assertEqual(None, Orbit(1).Word(2))
+    def test_transversal(self):
+        o = Orbit(1)
+        for x in o:
+            self.assertEqual(x, o.Transversal(x)[1])
+        t = Orbit((1, 2)).Transversal((28, 29))
+        self.assertEqual((28, 29), (t[1], t[2]))
+        self.assertEqual(None, o.Transversal(5))
+    def test_add_generators(self):
+        o = Orbit(1, [base.b0])
+        self.assertEqual(4, len(o))
+        self.assertEqual(4, o.AddGenerators(base.B[1:]))
+        self.assertEqual(sorted(Orbit(1)), sorted(o))
+        for x in o:
+            self.assertEqual(x, apply_word(1, o.Word(x), 'point'))
+        images = tuple([base.b2[i] for i in range(base.N+1)])
+        self.assertEqual(4, len(Orbit(28, [images], degree=base.N+1)))
+    def test_transversal_types(self):
+        images = tuple([base.b2[i] for i in range(base.N+1)])
+        o = Orbit(28, [images], degree=base.N+1)
+        t = o.Transversal(54)
+        self.assertTrue(isinstance(t, tuple))
+        self.assertEqual(54, t[28])
+        self.assertEqual(tuple(range(base.N+1)), Orbit(5, [], degree=base.N+1).Transversal(5))
+        self.assertTrue(isinstance(Orbit(1, [perm(1,2,3)]).Transversal(3), perm))
+    def test_transversal_order(self):
+        o = Orbit(1)
+        expected = o.Transversal(30)
+        perm.EVAL_ORDER = 0
+        try:
+            self.assertEqual(expected.p, o.Transversal(30).p)
+        finally:
+            perm.EVAL_ORDER = 1
+    def test_breadth_first(self):
+        o = Orbit(1)
+        lengths = [len(o.Word(x)) for x in o]
+        self.assertEqual(sorted(lengths), lengths)
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
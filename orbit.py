@@ -0,0 +1,201 @@
+"""
+File    orbit.py
+
+Description
+    Orbits of points, ordered tuples of points and unordered sets of
+    points under a list of generators, with Schreier vectors.
+
+    The orbit is enumerated breadth first, each element once per
+    generator, so the work is linear in orbit size times number of
+    generators. Every new element y = x^g records the index of the
+    generator g (the Schreier vector) and the position of x (a back
+    pointer), so for every element the word of generators reaching it
+    from the seed, and the transversal element (the product of those
+    generators, the first one applied first), are recovered without
+    storing permutations. AddGenerators extends an orbit by more
+    generators (as stabchain does while it adds strong generators),
+    applying only the new generators to the elements already found.
+
+        action    elements          x^g
+        point     int               g[x]
+        tuple     tuple of ints     (g[x_0], g[x_1], ...)
+        set       frozenset         {g[x] for x in the set}
+
+    The action is taken from the type of the seed unless given.
+
+Example
+    >>> o = orbit(1)                         # a corner facelet
+    >>> len(o)
+    24
+    >>> o.Word(28)                           # moves taking 1 to 28
+    >>> o.Transversal(28)[1]
+    28
+    >>> len(orbit([1, 2]))                   # ordered pairs
+    >>> len(orbit(set(base.fixed_points)))   # the centers stay put
+    1
+"""
+import base
+
+ACTIONS = ('point', 'tuple', 'set')
+
+
+def _image(g, degree):
+    # the image list of g on the points 0..degree-1; tuples of images
+    # (as in stabchain) are used as they are
+    if isinstance(g, tuple):
+        return g + tuple(range(len(g), degree))
+    return [g[i] for i in range(degree)]
+
+def _size(g):
+    if isinstance(g, tuple):
+        return len(g)
+    return g.size
+
+
+class orbit:
+    """
+    Orbit of a point, tuple or set with its Schreier vector.
+    """
+
+    def __init__(self, seed, gens=None, action=None, degree=None):
+        """
+        seed   - point, sequence (tuple action) or set (set action)
+        gens   - generators, permutations or tuples of the images of
+                 the points 0..degree-1, default base.B
+        action - one of ACTIONS, by default from the type of seed
+        degree - number of points the generators act on, by default
+                 from the generators and the seed
+        """
+        if gens is None:
+            gens = base.B
+        if action is None:
+            if isinstance(seed, int):
+                action = 'point'
+            elif isinstance(seed, (set, frozenset)):
+                action = 'set'
+            else:
+                action = 'tuple'
+        if action not in ACTIONS:
+            raise ValueError("orbit: unknown action %r" % (action,))
+        if action == 'point':
+            seed = int(seed)
+            points = [seed]
+        elif action == 'tuple':
+            seed = tuple(seed)
+            points = list(seed)
+        else:
+            seed = frozenset(seed)
+            points = list(seed)
+        self.gens    = []
+        self.action  = action
+        self.seed    = seed
+        if degree is None:
+            degree = max([_size(g) for g in gens] + [max(points + [0])+1])
+        self.degree  = degree
+        self.images  = []
+        self.elements = [seed]
+        self.index    = {seed: 0}
+        self.vector   = [-1]
+        self.parent   = [-1]
+        self.AddGenerators(gens)
+
+    def AddGenerators(self, gens):
+        """
+        Adds generators and extends the orbit under them, keeping the
+        elements found so far with their words. Returns the position
+        in elements of the first new element.
+        """
+        first = len(self.images)
+        degree = max([_size(g) for g in gens] + [self.degree])
+        if degree > self.degree:
+            # the old generators fix the new points
+            self.degree = degree
+            self.images = [_image(g, degree) for g in self.gens]
+        for g in gens:
+            self.gens.append(g)
+            self.images.append(_image(g, self.degree))
+        start = len(self.elements)
+        if self.action == 'point':
+            self._Close(first, start, None)
+        elif self.action == 'tuple':
+            self._Close(first, start, tuple)
+        else:
+            self._Close(first, start, frozenset)
+        return start
+
+    def _Close(self, first, start, make):
+        # the elements before start have their images under the
+        # generators before first already
+        images   = self.images
+        elements = self.elements
+        index    = self.index
+        vector   = self.vector
+        parent   = self.parent
+        i = 0
+        while i < len(elements):
+            x = elements[i]
+            for j in range(first if i < start else 0, len(images)):
+                image = images[j]
+                if make is None:
+                    y = image[x]
+                else:
+                    y = make([image[p] for p in x])
+                if y not in index:
+                    index[y] = len(elements)
+                    elements.append(y)
+                    vector.append(j)
+                    parent.append(i)
+            i = i + 1
+
+    def _Key(self, x):
+        if self.action == 'tuple':
+            return tuple(x)
+        if self.action == 'set':
+            return frozenset(x)
+        return x
+
+    def __len__(self):
+        return len(self.elements)
+
+    def __contains__(self, x):
+        return self._Key(x) in self.index
+
+    def __iter__(self):
+        return iter(self.elements)
+
+    def Word(self, x):
+        """
+        Returns the list of generator indices [j_0, j_1, ...] such that
+        applying gens[j_0], then gens[j_1], ... takes the seed to x,
+        or None if x is not in the orbit.
+        """
+        k = self.index.get(self._Key(x))
+        if k is None:
+            return None
+        word = []
+        while k > 0:
+            word.append(self.vector[k])
+            k = self.parent[k]
+        word.reverse()
+        return word
+
+    def Transversal(self, x):
+        """
+        Returns the element taking the seed to x, applying gens[j_0],
+        then gens[j_1], ... of Word(x) whatever perm.EVAL_ORDER is, or
+        None if x is not in the orbit. It has the type of the
+        generators: a tuple of images for tuple generators (or none),
+        else a permutation of the class of gens[0].
+        """
+        word = self.Word(x)
+        if word is None:
+            return None
+        image = list(range(self.degree))
+        for j in word:
+            g = self.images[j]
+            image = [g[y] for y in image]
+        if not self.gens or isinstance(self.gens[0], tuple):
+            return tuple(image)
+        return type(self.gens[0]).from_image(image, validate=False)
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
@@ -0,0 +1,31 @@
+import base
+import ida
+import parallel
+import problem1
+import unittest
+from perm import image_bytes
+
+class Test(unittest.TestCase):
+    def test_encode_decode(self):
+        a = base.b0*base.b3
+        self.assertEqual(base.N+1, len(image_bytes(a, base.N+1)))
+        self.assertEqual(a, parallel.decode(image_bytes(a, base.N+1)))
+    def test_breath_search_shallow(self):
+        self.assertEqual([0,0,0], parallel.parallel_breath_search(base.b0, 2))
+    def test_breath_search(self):
+        a = (base.b0*base.b5*base.b3*base.b0).Inverse()
+        moves = parallel.parallel_breath_search(a, 2, split_depth=1)
+        self.assertEqual(len(problem1.breath_search(a)), len(moves))
+        self.assertTrue(base.apply_moves(a, moves).IsIdentity())
+    def test_ida_search(self):
+        a = (base.b0*base.b5*base.b3*base.b3).Inverse()
+        moves = parallel.parallel_ida_search(a, processes=2, split_depth=1)
+        self.assertEqual(ida.ida_search(a), moves)
+    def test_ida_search_max_depth(self):
+        a = (base.b0*base.b5*base.b3).Inverse()
+        self.assertEqual(None, parallel.parallel_ida_search(a, processes=2, split_depth=1, max_depth=2))
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
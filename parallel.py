@@ -0,0 +1,134 @@
+"""
+Description:
+  parallel versions of the optimal searches on a process pool.
+
+  the search tree is split at split_depth into independent subtrees,
+  one task for every (non-redundant) move sequence of that length. the
+  search runs in rounds of increasing depth bound; in every round each
+  task searches its subtree up to the bound. the first solution
+  reported is therefore optimal, and the pool is terminated as soon as
+  it arrives, which cancels the remaining tasks.
+
+  states are sent to the workers in a compact form, the bytes of the
+  images of the points 0..base.N (see perm.image_bytes and decode), and moves as
+  small integers. heuristics are sent once per worker; pattern
+  databases are pickled by file name, so the workers map the same file.
+
+  parallel_breath_search finds solutions as short as the ones of
+  problem1.breath_search (counting base.B moves), parallel_ida_search
+  the ones of ida.ida_search (counting face turns); both return lists
+  of indices into base.B.
+"""
+import multiprocessing
+import base
+import ida
+from perm import frozenperm, image_bytes
+
+def decode(data):
+    return frozenperm.from_image(data, validate=False)
+
+def _run(tasks, worker, processes):
+    # runs the rounds produced by tasks (an iterator of task lists) and
+    # returns the first result that is not None
+    pool = multiprocessing.Pool(processes)
+    try:
+        for round_tasks in tasks:
+            for result in pool.imap_unordered(worker, round_tasks):
+                if result is not None:
+                    return result
+    finally:
+        pool.terminate()
+        pool.join()
+    return None
+
+# quarter turns of base.B
+
+def _quarter_allowed(j, last, run):
+    # at most three quarter turns of a face in a row, and of two
+    # commuting opposite faces only the smaller one first
+    if j == last:
+        return run < 3
+    return last < 0 or not (base.opposite[j] == last and j < last)
+
+def _quarter_search(state, togo, last, run, path):
+    if togo == 0:
+        return state.IsIdentity()
+    for j in range(len(base.B)):
+        if not _quarter_allowed(j, last, run):
+            continue
+        path.append(j)
+        if _quarter_search(base.B[j]*state, togo-1, j, run+1 if j == last else 1, path):
+            return True
+        path.pop()
+    return False
+
+def _quarter_task(task):
+    data, prefix, last, run, togo = task
+    path = list(prefix)
+    if _quarter_search(decode(data), togo, last, run, path):
+        return path
+    return None
+
+def _quarter_rounds(prefixes, split_depth, max_depth):
+    tasks = [(image_bytes(state, base.N+1), prefix, last, run) for state, prefix, last, run in prefixes]
+    for depth in range(split_depth+1, max_depth+1):
+        yield [task + (depth-split_depth,) for task in tasks]
+
+def parallel_breath_search(a, processes=None, split_depth=2, max_depth=20):
+    for depth in range(split_depth+1):
+        path = []
+        if _quarter_search(a, depth, -1, 0, path):
+            return path
+    prefixes = [(a, [], -1, 0)]
+    for d in range(split_depth):
+        prefixes = [(base.B[j]*state, prefix+[j], j, run+1 if j == last else 1)
+                    for state, prefix, last, run in prefixes
+                    for j in range(len(base.B)) if _quarter_allowed(j, last, run)]
+    return _run(_quarter_rounds(prefixes, split_depth, max_depth),
+                _quarter_task, processes)
+
+# face turns of ida.MOVES
+
+_heuristic = ida.zero_heuristic
+
+def _set_heuristic(heuristic):
+    global _heuristic
+    _heuristic = heuristic
+
+def _ida_task(task):
+    # returns the solution, or the smallest cost exceeding the bound
+    data, prefix, last, bound = task
+    path = list(prefix)
+    t = ida._search(decode(data), len(prefix), bound, last, path, _heuristic)
+    if t is True:
+        return True, ida.expand(path)
+    return False, t
+
+def parallel_ida_search(a, heuristic=ida.zero_heuristic, processes=None,
+                        split_depth=2, max_depth=20):
+    solution = ida.ida_search(a, heuristic, min(split_depth, max_depth))
+    if solution is not None or split_depth >= max_depth:
+        return solution
+    prefixes = [(a, [], -1)]
+    for d in range(split_depth):
+        prefixes = [(p*state, prefix+[(face, power)], face)
+                    for state, prefix, last in prefixes
+                    for face, power, p in ida.MOVES if ida._allowed(face, last)]
+    bound = max(split_depth+1, heuristic(a))
+    pool = multiprocessing.Pool(processes, _set_heuristic, (heuristic,))
+    try:
+        tasks = [(image_bytes(state, base.N+1), prefix, last) for state, prefix, last in prefixes]
+        while bound <= max_depth:
+            next_bound = None
+            for found, value in pool.imap_unordered(_ida_task, [task + (bound,) for task in tasks]):
+                if found:
+                    return value
+                if next_bound is None or value < next_bound:
+                    next_bound = value
+            bound = next_bound
+    finally:
+        pool.terminate()
+        pool.join()
+    return None
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
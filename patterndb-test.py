@@ -0,0 +1,57 @@
+import patterndb
+import base
+import ida
+import os
+import random
+import tempfile
+import unittest
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp(suffix=".pdb")
+        os.close(fd)
+        self.db = patterndb.Build(self.filename, [1,3])
+    def tearDown(self):
+        self.db.Close()
+        os.remove(self.filename)
+    def test_header(self):
+        self.assertEqual(24, len(self.db.domain))
+        self.assertEqual([1,3], self.db.points)
+        # positions of two of 8 corners and their orientations
+        self.assertEqual(8*7*3*3, self.db.size)
+    def test_all_ranks_reachable(self):
+        for r in range(self.db.size):
+            self.assertNotEqual(patterndb.UNKNOWN, self.db.Lookup(r))
+    def test_size(self):
+        # the orientation of the last cubie follows from the others
+        self.assertEqual(40320*3**7, patterndb.NrRanks([1,7,9,3,37,39,43,45]))
+        self.assertEqual(8*7*6*5*3**4 * 12*11*10*9*2**4,
+                         patterndb.NrRanks(patterndb.CORNERS_U + patterndb.EDGES_U))
+    def test_invalid_points(self):
+        self.assertRaises(ValueError, patterndb.NrRanks, [5])
+        self.assertRaises(ValueError, patterndb.NrRanks, [9,28])
+    def test_solved_state(self):
+        self.assertEqual(0, self.db.Distance(base.b0.Identity()))
+        # the default moves include the inverse quarter turns
+        self.assertEqual(1, self.db.Distance(base.b0))
+    def test_distances_are_consistent(self):
+        rng = random.Random(5)
+        db = patterndb.Load(self.filename)
+        for i in range(20):
+            state = base.b0.Identity()
+            for j in range(rng.randrange(1, 12)):
+                state = rng.choice(base.B)*state
+            d = db.Distance(state)
+            successors = [db.Distance(g*state) for g in ida.GENERATORS]
+            self.assertTrue(d <= 1 + min(successors))
+            if d > 0:
+                self.assertEqual(d - 1, min(successors))
+        db.Close()
+    def test_max_heuristic(self):
+        h = patterndb.MaxHeuristic([self.db, self.db])
+        self.assertEqual(self.db.Distance(base.b2), h(base.b2))
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
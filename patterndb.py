@@ -0,0 +1,327 @@
+"""
+File    patterndb.py
+
+Description
+    Pattern databases: exact distances to the solved state for
+    projections of the cube state, usable as admissible heuristics.
+
+    A projection tracks the stickers in points and forgets all others.
+    Its pattern is the tuple of the positions of the tracked stickers,
+    i.e. for a state s the points i with s[i] = points[k]. A sticker
+    of a corner or edge (see cubie.py) stands for its cubie, so a
+    pattern is ranked by the positions of the tracked cubies among the
+    8 corners or 12 edges (perm.rank_images) and their orientations,
+    the orientation of the last cubie being left out if all cubies of
+    its kind are tracked, as in coord.twist. With moves generating the
+    cube group all ranks are reachable, e.g. the 8!*3^7 ranks of all 8
+    corners. The distances are enumerated by breadth first search from
+    the solved pattern.
+
+    Distances are stored as 4 bit nibbles (value 15 marks unreachable
+    ranks, larger distances are capped at 14, which keeps the heuristic
+    admissible) after a small header:
+
+        8 bytes   magic b"RCTPPDB2"
+        1 uint16  k = number of tracked points
+        k uint16  tracked points
+        nibbles   (number of ranks + 1) // 2 bytes, low nibble first
+
+    Loaded databases are memory mapped read-only, so all processes
+    using the same file share one copy of the table in the page cache.
+    Pickling a database only transfers its file name.
+
+    One sticker per cubie determines the position and the orientation
+    of the cubie, so the projections track exactly one sticker of each
+    of a few corners or edges.
+
+Example
+    >>> db = patterndb.Build("corners_u.pdb", patterndb.CORNERS_U)
+    >>> db = patterndb.Load("corners_u.pdb")
+    >>> db.Distance(base.b0 * base.b2)
+"""
+import mmap
+import struct
+import base
+import cubie
+import ida
+import symmetry
+from orbit import orbit
+from perm import rank_images
+
+MAGIC = b"RCTPPDB2"
+UNKNOWN = 15
+
+# one sticker of each corner or edge in the upper, lower and middle layers
+CORNERS_U = [1,3,7,9]
+CORNERS_D = [37,39,43,45]
+EDGES_U   = [2,4,6,8]
+EDGES_D   = [38,40,42,44]
+EDGES_E   = [22,24,49,51]
+
+
+def Orbit(points, gens):
+    """
+    Returns the union of the orbits of points under gens.
+    """
+    domain = set()
+    for x in points:
+        if x not in domain:
+            domain.update(orbit(x, gens))
+    return sorted(domain)
+
+def NrPatterns(m, k):
+    """
+    Returns the number of k-tuples of distinct elements out of m,
+    the number of ranks of perm.rank_images.
+    """
+    n = 1
+    for i in range(k):
+        n = n * (m - i)
+    return n
+
+def _kinds(points):
+    # for the corners and the edges among points (m cubies with n
+    # orientations) the tuple (m, n, tracked, twists): tracked is the
+    # list of (k, location) of the points[k] of that kind, location
+    # mapping every facelet of the kind to the position and the
+    # orientation of the cubie of points[k] when its sticker is there,
+    # and twists is the number of orientations ranked
+    kinds = []
+    found = 0
+    for cubies, facelets in ((cubie.CORNERS, cubie.CORNER_FACELETS),
+                             (cubie.EDGES, cubie.EDGE_FACELETS)):
+        m = len(cubies)
+        n = len(cubies[0])
+        tracked = []
+        for k in range(len(points)):
+            if points[k] in facelets:
+                c, t = facelets[points[k]]
+                location = {}
+                for x in facelets:
+                    j, u = facelets[x]
+                    location[x] = (j, (u - t) % n)
+                tracked.append((k, location))
+        if len(set([facelets[points[k]][0] for k, location in tracked])) < len(tracked):
+            raise ValueError("patterndb: points must be facelets of different cubies")
+        if tracked:
+            # the orientations of all cubies of a kind add up to 0
+            kinds.append((m, n, tracked, len(tracked) - (len(tracked) == m)))
+        found = found + len(tracked)
+    if found != len(points):
+        raise ValueError("patterndb: points must be corner or edge facelets")
+    return kinds
+
+def _rank(kinds, pattern):
+    # the rank of pattern, a tuple of the positions of the tracked
+    # stickers, in mixed radix: the positions of the tracked cubies of
+    # each kind, then their orientations
+    rank = 0
+    for m, n, tracked, twists in kinds:
+        positions = []
+        orientations = []
+        for k, location in tracked:
+            j, o = location[pattern[k]]
+            positions.append(j)
+            orientations.append(o)
+        rank = rank * NrPatterns(m, len(tracked)) + rank_images(positions, m)
+        for o in orientations[:twists]:
+            rank = rank * n + o
+    return rank
+
+def NrRanks(points):
+    """
+    Returns the number of ranks of the patterns of the projection
+    tracking points.
+    """
+    size = 1
+    for m, n, tracked, twists in _kinds(points):
+        size = size * NrPatterns(m, len(tracked)) * n**twists
+    return size
+
+def _domain(kinds):
+    # the facelets of the kinds of cubies tracked
+    domain = []
+    for m, n, tracked, twists in kinds:
+        domain.extend(tracked[0][1])
+    return sorted(domain)
+
+
+class patterndb:
+    """
+    Read-only pattern database backed by a memory mapped file.
+    """
+
+    def __init__(self, filename):
+        """
+        filename - pattern database written by Build()
+        """
+        self.filename = filename
+        f = open(filename, "rb")
+        try:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        finally:
+            f.close()
+        if self.mm[0:len(MAGIC)] != MAGIC:
+            self.mm.close()
+            raise ValueError("patterndb: %s is not a pattern database" % filename)
+        offset = len(MAGIC)
+        k, = struct.unpack_from("<H", self.mm, offset)
+        offset = offset + 2
+        self.points = list(struct.unpack_from("<%dH" % k, self.mm, offset))
+        self.offset = offset + 2*k
+        self.kinds  = _kinds(self.points)
+        self.domain = _domain(self.kinds)
+        self.size   = NrRanks(self.points)
+        self.index  = {}
+        for k in range(len(self.points)):
+            self.index[self.points[k]] = k
+
+    def Pattern(self, state):
+        """
+        Returns the pattern of state, the tuple of the positions of the
+        tracked stickers.
+        """
+        pattern = [0] * len(self.points)
+        index   = self.index
+        for i in self.domain:
+            k = index.get(state[i])
+            if k is not None:
+                pattern[k] = i
+        return tuple(pattern)
+
+    def Rank(self, pattern):
+        """
+        Returns the rank of pattern, in range(self.size).
+        """
+        return _rank(self.kinds, pattern)
+
+    def Lookup(self, rank):
+        """
+        Returns the stored distance of the pattern with given rank.
+        """
+        byte = self.mm[self.offset + (rank >> 1)]
+        return (byte >> ((rank & 1) << 2)) & 15
+
+    def Distance(self, state):
+        """
+        Returns a lower bound of the number of moves needed to solve
+        state, or UNKNOWN if its pattern is unreachable.
+        """
+        return self.Lookup(_rank(self.kinds, self.Pattern(state)))
+
+    __call__ = Distance
+
+    def Close(self):
+        self.mm.close()
+
+    def __getstate__(self):
+        # pickled by file name, so worker processes map the same file
+        # instead of receiving a copy of the table
+        return self.filename
+
+    def __setstate__(self, filename):
+        self.__init__(filename)
+
+
+def _conjugations(points, domain, symmetries):
+    # for every symmetry q the pair (sources, images) such that the
+    # pattern of q^-1 s q is (images[p[j]] for j in sources) for the
+    # pattern p of s
+    result = []
+    position = dict([(points[j], j) for j in range(len(points))])
+    for q in symmetries:
+        inverse = q.Inverse()
+        moved = [inverse[x] for x in points]
+        if set(moved) != set(points) or set([q[x] for x in domain]) != set(domain):
+            raise ValueError("patterndb: a symmetry does not preserve the tracked points")
+        result.append(([position[x] for x in moved], [q[x] for x in range(base.N+1)]))
+    return result
+
+def Build(filename, points, gens=None, symmetries=None):
+    """
+    filename   - output file
+    points     - stickers tracked by the projection
+    gens       - moves of the search the heuristic is used in,
+                 default ida.GENERATORS; the distances count every
+                 generator as one move
+    symmetries - symmetries (see symmetry.py) preserving gens and the
+                 set points, e.g. symmetry.stabilizer(points,
+                 symmetry.preserving(gens)); only one pattern of every
+                 class of conjugate patterns is expanded
+
+    Enumerates the patterns of the projection by breadth first search,
+    writes the database and returns it loaded.
+    """
+    if gens is None:
+        gens = ida.GENERATORS
+    kinds = _kinds(points)
+    # moves act on positions: applying move g to a state moves the
+    # sticker at position g[x] to x, so the predecessors of a pattern
+    # are its images under the generators
+    moves = [[g[x] for x in range(base.N+1)] for g in gens]
+    conjugations = []
+    if symmetries is not None:
+        symmetry.check_moves(symmetries, gens)
+        conjugations = _conjugations(points, _domain(kinds), symmetries)
+
+    table = bytearray([0xFF]) * ((NrRanks(points) + 1) // 2)
+    start = tuple(points)
+    level = [start]
+    distance = 0
+    r = _rank(kinds, start)
+    table[r >> 1] = table[r >> 1] & ~(15 << ((r & 1) << 2)) & 0xFF
+    while level:
+        distance = distance + 1
+        value = min(distance, UNKNOWN - 1)
+        next_level = []
+        for pattern in level:
+            for move in moves:
+                q = tuple([move[x] for x in pattern])
+                r = _rank(kinds, q)
+                shift = (r & 1) << 2
+                byte = table[r >> 1]
+                if (byte >> shift) & 15 == UNKNOWN:
+                    table[r >> 1] = (byte & ~(15 << shift) & 0xFF) | (value << shift)
+                    next_level.append(q)
+                    # conjugate patterns are equally far, but need not
+                    # be expanded
+                    for sources, images in conjugations:
+                        r = _rank(kinds, [images[q[j]] for j in sources])
+                        shift = (r & 1) << 2
+                        byte = table[r >> 1]
+                        if (byte >> shift) & 15 == UNKNOWN:
+                            table[r >> 1] = (byte & ~(15 << shift) & 0xFF) | (value << shift)
+        level = next_level
+
+    f = open(filename, "wb")
+    try:
+        f.write(MAGIC)
+        f.write(struct.pack("<H", len(points)))
+        f.write(struct.pack("<%dH" % len(points), *points))
+        f.write(table)
+    finally:
+        f.close()
+    return patterndb(filename)
+
+def Load(filename):
+    """
+    Returns the pattern database stored in filename.
+    """
+    return patterndb(filename)
+
+class _maxheuristic:
+    def __init__(self, dbs):
+        self.dbs = list(dbs)
+
+    def __call__(self, state):
+        return max([db.Distance(state) for db in self.dbs])
+
+def MaxHeuristic(dbs):
+    """
+    Returns a heuristic function giving the maximum of the distances
+    of several databases, which is admissible as well. It can be
+    pickled, e.g. to be sent to worker processes.
+    """
+    return _maxheuristic(dbs)
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
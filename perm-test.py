@@ -0,0 +1,208 @@
+from perm import perm, frozenperm, byteperm, sparseperm, compact, image_bytes, rank_images, unrank_images
+import unittest
+
+class Test(unittest.TestCase):
+    def test_frozen_equals_perm(self):
+        self.assertEqual(perm(1,2,3), frozenperm(1,2,3))
+        self.assertEqual(frozenperm(1,2,3), perm(1,2,3).Freeze())
+    def test_frozen_hash_ignores_size(self):
+        p = frozenperm(1,2)
+        q = (perm(1,2)*perm(3,4)*perm(3,4)).Freeze()
+        self.assertEqual(p, q)
+        self.assertEqual(hash(p), hash(q))
+        self.assertEqual(1, len(set([p, q])))
+        self.assertEqual(hash(frozenperm()), hash((perm(5,6)*perm(5,6)).Freeze()))
+    def test_frozen_operations_stay_frozen(self):
+        p = frozenperm(1,2,3)
+        q = frozenperm(3,4)
+        self.assertTrue(isinstance(p*q, frozenperm))
+        self.assertTrue(isinstance(p.Inverse(), frozenperm))
+        self.assertEqual(perm(1,2,3)*perm(3,4), p*q)
+        self.assertTrue((p*p.Inverse()).IsIdentity())
+    def test_frozen_is_immutable(self):
+        p = frozenperm(1,2,3)
+        with self.assertRaises(TypeError):
+            p.p[1] = 1
+    def test_identity_order(self):
+        self.assertEqual(1, perm().Order())
+        self.assertEqual(1, frozenperm().Order())
+        self.assertEqual(1, byteperm().Order())
+        self.assertTrue(perm().IntPow(5).IsIdentity())
+    def test_nr_inversions(self):
+        self.assertEqual(6, perm([2,3],[4,1]).NrInversions())
+        self.assertEqual(0, perm().NrInversions())
+        self.assertEqual(1, perm(4,5).NrInversions())
+        self.assertEqual(3, perm(1,3).NrInversions())
+    def test_rank_is_dense(self):
+        ranks = set()
+        for a in range(1, 4):
+            for b in range(1, 4):
+                if a != b:
+                    p = perm().FromImage([a, b, 6-a-b])
+                    ranks.add(p.Rank())
+                    self.assertEqual(p, perm().Unrank(p.Rank(), 3))
+        self.assertEqual(set(range(6)), ranks)
+    def test_rank_ignores_size(self):
+        self.assertEqual(perm(1,2,3).Rank(), (perm(1,2,3)*perm(7,8)*perm(7,8)).Rank())
+        self.assertEqual(4, perm(1,2,3).Rank())
+        self.assertEqual(perm(1,2,3), perm().Unrank(4, 10))
+    def test_rank_on(self):
+        self.assertEqual(0, perm().RankOn([1,2], 3))
+        self.assertEqual(2, perm(1,2).RankOn([1,2], 3))
+        self.assertEqual(5, perm(1,3).RankOn([1,2], 3))
+    def test_rank_images_is_dense(self):
+        ranks = set()
+        for a in range(4):
+            for b in range(4):
+                if a != b:
+                    r = rank_images((a,b), 4)
+                    ranks.add(r)
+                    self.assertEqual([a,b], unrank_images(r, 2, 4))
+        self.assertEqual(set(range(12)), ranks)
+    def test_frozen_cached_properties(self):
+        p = perm([1,2],[3,4,5])
+        q = p.Freeze()
+        for i in range(2):
+            self.assertEqual(p.Cycles(), q.Cycles())
+            self.assertEqual(6, q.Order())
+            self.assertEqual(-1, q.Sign())
+            self.assertEqual([0, 0, 1, 1, 0, 0], q.CycleCounts())
+        self.assertEqual([()], frozenperm().Cycles())
+        self.assertEqual(1, frozenperm().Sign())
+        self.assertEqual(p.IntPow(5), q.IntPow(5))
+    def test_cached_values_are_copies(self):
+        q = frozenperm(1,2)
+        q.Cycles().append((3,4))
+        self.assertEqual([(1,2)], q.Cycles())
+    def test_slots(self):
+        with self.assertRaises(AttributeError):
+            frozenperm(1,2).extra = 1
+        with self.assertRaises(AttributeError):
+            perm(1,2).extra = 1
+    def test_from_image(self):
+        self.assertEqual(perm(1,2,3), perm.from_image([0,2,3,1]))
+        self.assertEqual(perm(1,2,3), perm.from_image(bytes([0,2,3,1])))
+        self.assertEqual(perm(1,2,3), perm.from_image(memoryview(bytearray([0,2,3,1,4]))))
+        q = frozenperm.from_image(bytes([0,2,3,1,4,5]))
+        self.assertTrue(isinstance(q, frozenperm))
+        self.assertEqual(hash(frozenperm(1,2,3)), hash(q))
+        for image in ([0,2,2,1], [1,0,2], [0,3,1]):
+            with self.assertRaises(ValueError):
+                perm.from_image(image)
+    def test_from_cycles(self):
+        self.assertEqual(perm((1,2,3),(4,5)), perm.from_cycles([(1,2,3),(4,5)]))
+        self.assertEqual(perm(), perm.from_cycles([]))
+        self.assertEqual(10, perm.from_cycles([(1,2)], 10).size)
+        self.assertTrue(isinstance(frozenperm.from_cycles([(1,2)]), frozenperm))
+        for cycles in ([(1,2),(2,3)], [(0,1)]):
+            with self.assertRaises(ValueError):
+                perm.from_cycles(cycles)
+        with self.assertRaises(ValueError):
+            perm.from_cycles([(1,5)], 4)
+    def test_byteperm_matches_perm(self):
+        p = perm((1,2,3),(5,9))
+        q = perm(2,7)
+        bp = byteperm((1,2,3),(5,9))
+        bq = byteperm.from_cycles([(2,7)])
+        self.assertEqual(p*q, bp*bq)
+        self.assertEqual(q*p, bq*bp)
+        self.assertEqual(p.Inverse(), bp.Inverse())
+        self.assertEqual(p*q, bp*q)
+        self.assertTrue(isinstance(bp*bq, byteperm))
+        self.assertTrue(isinstance(bp.Inverse(), byteperm))
+        self.assertTrue(isinstance(bp.IntPow(2), byteperm))
+        self.assertEqual(p.IntPow(2), bp.IntPow(2))
+        self.assertEqual(6, bp.Order())
+    def test_byteperm_hash(self):
+        bp = byteperm(1,2,3)
+        self.assertEqual(frozenperm(1,2,3), bp)
+        self.assertEqual(bp, frozenperm(1,2,3))
+        self.assertEqual(hash(frozenperm(1,2,3)), hash(bp))
+        self.assertEqual(1, len(set([bp, frozenperm(1,2,3), (bp*byteperm(4,5)*byteperm(4,5))])))
+    def test_byteperm_image(self):
+        bp = byteperm(1,2,3)
+        self.assertEqual(2, bp.Image(1))
+        self.assertEqual([2,3,1,4], bp.Image([1,2,3,4]))
+        self.assertEqual(bytes([0,2,3,1,4]), bp.Image(bytes([0,1,2,3,4])))
+    def test_byteperm_degree(self):
+        with self.assertRaises(ValueError):
+            byteperm(1,300)
+    def test_byteperm_right_to_left(self):
+        perm.EVAL_ORDER = 0
+        try:
+            self.assertEqual(perm(1,2)*perm(2,3), byteperm(1,2)*byteperm(2,3))
+        finally:
+            perm.EVAL_ORDER = 1
+    def test_image_bytes(self):
+        self.assertEqual(bytes([0,2,3,1,4]), image_bytes(perm(1,2,3), 5))
+        self.assertEqual(bytes([0,2,3,1,4]), image_bytes(byteperm(1,2,3), 5))
+        self.assertEqual(bytes([0,1,2]), image_bytes(perm(4,5)*perm(4,5), 3))
+        self.assertRaises(ValueError, image_bytes, byteperm(1,2,3), 2)
+        self.assertRaises(ValueError, image_bytes, byteperm(1,60), 55)
+        self.assertRaises(ValueError, image_bytes, perm(1,60), 55)
+        self.assertEqual(256, len(image_bytes(frozenperm(1,2), 256)))
+    def test_sparse_stores_moved_points(self):
+        s = sparseperm.from_cycles([(1,10**6)])
+        self.assertEqual({1: 10**6, 10**6: 1}, s.p)
+        self.assertEqual(10**6+1, s.size)
+        self.assertEqual([(1,10**6)], s.Cycles())
+        self.assertEqual(s, perm(1,10**6))
+        self.assertEqual({}, sparseperm(1,2,1).p)
+        self.assertEqual({}, sparseperm().p)
+        for args in [(1,2,3,4), ([1,2,3,4],), ([1,2],[1,3],[1,4]), ([1,4],[1,3],[1,2]),
+                     ([1,2],[3,4]), ((10**6,2),(2,3)), ([],[5,6])]:
+            self.assertEqual(perm(*args), sparseperm(*args))
+        with self.assertRaises(ValueError):
+            sparseperm.from_cycles([(1,2),(2,3)])
+    def test_sparse_matches_perm(self):
+        p = perm((1,5,3),(7,8))
+        q = perm(2,3,9)
+        s = p.Sparse()
+        t = q.Sparse()
+        self.assertTrue(isinstance(s, sparseperm))
+        self.assertEqual(p, s)
+        self.assertEqual(p, s.Dense())
+        self.assertEqual(p*q, s*t)
+        self.assertEqual(p.Inverse(), s.Inverse())
+        self.assertEqual(p.CycleCounts(), s.CycleCounts())
+        self.assertEqual(p.Order(), s.Order())
+        self.assertEqual(p.Sign(), s.Sign())
+        self.assertEqual(p.MovedPoints(), s.MovedPoints())
+        self.assertEqual(p.ToImage(), s.ToImage())
+        self.assertEqual(p.Freeze(), s.Freeze())
+        self.assertEqual(p.IntPow(5), s.IntPow(5))
+    def test_sparse_sign(self):
+        for p in [perm(), perm(1,2), perm(1,2,3), perm((1,2),(3,4,5,6)), perm((1,2),(10**5,3))]:
+            self.assertEqual(p.Sign(), p.Sparse().Sign())
+        self.assertTrue(sparseperm(1,10**7).IsOddPermutation())
+    def test_sparse_mixed_products(self):
+        p = perm((1,5,3),(7,8))
+        s = sparseperm(2,3,9)
+        q = s.Dense()
+        self.assertEqual(p*q, p*s)
+        self.assertEqual(q*p, s*p)
+        self.assertTrue(type(p*s) is perm)
+        self.assertTrue(type(s*p) is perm)
+        self.assertEqual(byteperm(1,2)*q, byteperm(1,2)*s)
+        self.assertEqual(frozenperm(1,2)*q, frozenperm(1,2)*s)
+        perm.EVAL_ORDER = 0
+        try:
+            self.assertEqual(p*q, p*s)
+            self.assertEqual(q*p, s*p)
+            self.assertEqual(p*q, p.Sparse()*s)
+        finally:
+            perm.EVAL_ORDER = 1
+    def test_compact(self):
+        s = sparseperm(1,100)
+        self.assertTrue(compact(s) is s)
+        self.assertTrue(isinstance(compact(perm(1,100)), sparseperm))
+        self.assertTrue(type(compact(perm(1,2,3))) is perm)
+        self.assertTrue(type(compact(sparseperm(1,2,3))) is perm)
+        # a product moving most of its points becomes dense
+        self.assertTrue(type(sparseperm(1,2,3)*sparseperm(3,4)) is perm)
+        self.assertTrue(isinstance(sparseperm(1,100)*sparseperm(2,99), sparseperm))
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
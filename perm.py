@@ -7,6 +7,9 @@ Description
     of the list is generally the largest point moved plus one
     to include the 0 point (Python convention first index is zero).
  
+    sparseperm stores a dict of the moved points only, for
+    permutations of large degree moving few points.
+ 
  
 Author
     Ernesto P. Adorio, Ph.D.
@@ -73,6 +76,108 @@ import sequence as seq
 from mathutils import *
  
  
+def _IsImage(p):
+    """
+    Returns True if p is a permutation of range(len(p)) fixing the
+    points below PERM_BASE.
+    """
+    seen = [False] * len(p)
+    for i in range(len(p)):
+        x = p[i]
+        if x < 0 or x >= len(p) or seen[x]:
+            return False
+        if i < perm.PERM_BASE and x != i:
+            return False
+        seen[x] = True
+    return True
+ 
+ 
+class _fenwick:
+    """
+    Binary indexed tree of counts of the points 0..size-1.
+    """
+    def __init__(self, size, first = None):
+        """
+        size  - number of points
+        first - if given, the points first..size-1 are counted once,
+                set up in O(n) instead of n calls of Add
+        """
+        self.size = size
+        self.tree = [0] * (size + 1)
+        if first is not None:
+            tree = self.tree
+            for x in range(first + 1, size + 1):
+                tree[x] = 1
+            for x in range(1, size + 1):
+                parent = x + (x & -x)
+                if parent <= size:
+                    tree[parent] = tree[parent] + tree[x]
+ 
+    def Add(self, x, count = 1):
+        x = x + 1
+        while x <= self.size:
+            self.tree[x] = self.tree[x] + count
+            x = x + (x & -x)
+ 
+    def Sum(self, x):
+        """
+        Returns the count of the points smaller than x.
+        """
+        total = 0
+        while x > 0:
+            total = total + self.tree[x]
+            x = x - (x & -x)
+        return total
+ 
+    def Find(self, k):
+        """
+        Returns the k-th smallest point counted, k >= 1.
+        """
+        x    = 0
+        step = 1
+        while step * 2 <= self.size:
+            step = step * 2
+        while step > 0:
+            if x + step <= self.size and self.tree[x + step] < k:
+                x = x + step
+                k = k - self.tree[x]
+            step = step // 2
+        return x
+ 
+ 
+def rank_images(images, n):
+    """
+    images - sequence of k distinct points in range(n)
+    n      - number of points
+ 
+    Returns the rank of images among all k-tuples of distinct points
+    in range(n), a dense index in 0..n!/(n-k)!-1 in mixed radix n,
+    n-1, ...  The unused points below each image are counted with a
+    bit mask, k operations on n-bit integers.
+    """
+    rank = 0
+    used = 0
+    for i in range(len(images)):
+        x    = images[i]
+        rank = rank * (n - i) + x - (used & ((1 << x) - 1)).bit_count()
+        used = used | (1 << x)
+    return rank
+ 
+ 
+def unrank_images(rank, k, n):
+    """
+    Returns the list of k distinct points in range(n) with the given
+    rank, the inverse of rank_images.
+    """
+    digits = []
+    for i in range(k - 1, -1, -1):
+        digits.append(rank % (n - i))
+        rank = rank // (n - i)
+    digits.reverse()
+    points = list(range(n))
+    return [points.pop(d) for d in digits]
+ 
+ 
 RIGHT_TO_LEFT_EVAL_ORDER = 0
 LEFT_TO_RIGHT_EVAL_ORDER = 1
  
@@ -84,6 +189,7 @@ class perm:
                    #   0   -  right to left
                    #   1   -  left to right
     PERM_BASE = 1 # default.
+    __slots__ = ('size', 'p', 'base')
  
     def __init__(self, *kargs):
         """
@@ -183,6 +289,74 @@ class perm:
             self.p    = []
         return
  
+    @classmethod
+    def from_image(cls, image, validate = True):
+        """
+        image    - sequence of the images of the points 0, 1, ..., such
+                   as a list, bytes, bytearray, array or memoryview
+        validate - check that image is a permutation fixing the points
+                   below PERM_BASE
+ 
+        Returns a permutation of class cls built from the full internal
+        image array in O(n), without going through cycles.
+        Raises ValueError if validation fails.
+ 
+        Ex.  perm.from_image([0,2,3,1]) == perm(1,2,3)
+             frozenperm.from_image(bytes(range(55)))
+        """
+        p = list(image)
+        if validate and not _IsImage(p):
+            raise ValueError("perm.from_image(): not a valid image array")
+        result = cls()
+        result._SetImage(p)
+        return result
+ 
+    @classmethod
+    def from_cycles(cls, cycles, size = None, validate = True):
+        """
+        cycles   - sequence of disjoint cycles
+        size     - size of the internal image array, by default the
+                   largest point plus one
+        validate - check that the cycles are disjoint and their points
+                   are at least PERM_BASE and below size
+ 
+        Returns a permutation of class cls. Unlike perm(), the cycles
+        are written directly into one image array in O(n), so they
+        must be disjoint; without validation overlapping cycles give
+        undefined results. Raises ValueError if validation fails.
+ 
+        Ex.  perm.from_cycles([(1,2,3),(4,5)]) == perm((1,2,3),(4,5))
+        """
+        if size is None:
+            size = perm.PERM_BASE
+            for cycle in cycles:
+                for x in cycle:
+                    if x + 1 > size:
+                        size = x + 1
+        p = list(range(size))
+        if validate:
+            seen = [False] * size
+            for cycle in cycles:
+                for x in cycle:
+                    if x < perm.PERM_BASE or x >= size or seen[x]:
+                        raise ValueError("perm.from_cycles(): cycles are not disjoint cycles of valid points")
+                    seen[x] = True
+        for cycle in cycles:
+            for k in range(len(cycle) - 1):
+                p[cycle[k]] = cycle[k + 1]
+            if len(cycle) > 0:
+                p[cycle[-1]] = cycle[0]
+        result = cls()
+        result._SetImage(p)
+        return result
+ 
+    def _SetImage(self, p):
+        """
+        Internal command. Stores image list p.
+        """
+        self.p    = list(p)
+        self.size = len(p)
+ 
     def Pack(self):
         """
         Internal command. Decreases size of internal representation.
@@ -277,7 +451,7 @@ class perm:
         Multiplication of two permutations
         Needs to be rewritten.
         """
-        if type(other) != type(self):
+        if not isinstance(other, perm):
             return self.Image(other)
  
         size   = max(self.size, other.size)
@@ -367,14 +541,30 @@ class perm:
         """
         return self.FromImage(self.p[1:])
  
+    def Freeze(self):
+        """
+        Returns an immutable and hashable copy of self.
+        """
+        result = frozenperm()
+        result._SetImage(self.p)
+        return result
+ 
+    def Sparse(self):
+        """
+        Returns a copy of self storing only the moved points.
+        """
+        return sparseperm.from_image(self.p, validate = False)
+ 
     def Order(self):
         """
         Returns the order of the element.
         It is computed as the lcm of the lengths of the
-        cycles.
+        cycles; the identity has order 1.
         """
         cycles  = self.Cycles()
         acycles = [ len(cyc) for cyc in cycles if len(cyc) > 1 ]
+        if len(acycles) == 0:
+            return 1
         return lcm(acycles)
  
  
@@ -392,7 +582,7 @@ class perm:
                   perm    conjugate of p by q,  (q p q^-1)
                   int     integer power p^ n
         """
-        if type(q) == type(self.Identity()):
+        if isinstance(q, perm):
             return self.Conjugate(q)
         elif type(q) == type(1):
             return self.IntPow(q)
@@ -514,15 +704,69 @@ class perm:
           2:  1       1
         --------------------
               Total   6
+ 
+        Counted with a binary indexed tree in O(n log n).
         """
         count = 0
-        for i in range(1, self.size-1):
-            x = self[i]
-            for j in range(i+1, self.size):
-                if x > self[j]:
-                    count = count + 1
+        tree  = _fenwick(self.size)
+        for i in range(self.size-1, perm.PERM_BASE-1, -1):
+            # points right of i with a smaller image
+            count = count + tree.Sum(self[i])
+            tree.Add(self[i])
         return count
  
+    def Rank(self):
+        """
+        Returns the rank of the permutation, a dense index: the
+        permutations of the points 1..n get the ranks 0..n!-1.
+ 
+        The rank is sum c_i (i-1)!  where c_i counts the points j < i
+        with a larger image than i (the inversion table), so it does
+        not depend on the size of the internal representation.
+        Read from the last point down, with the images counted down
+        from the largest point, these are the digits of rank_images.
+ 
+        Example.
+           perm().Rank()          0
+           perm(1,2).Rank()       1
+           perm(1,2,3).Rank()     4
+        """
+        last = self.size - 1
+        return rank_images([last - self[i] for i in range(last, perm.PERM_BASE - 1, -1)],
+                           self.size - perm.PERM_BASE)
+ 
+    def Unrank(self, rank, degree):
+        """
+        rank   - rank as returned by Rank()
+        degree - number of points
+ 
+        Returns the permutation of the points 1..degree with the given
+        rank. Computed in O(n log n).
+        """
+        digits = []
+        for i in range(1, degree + 1):
+            digits.append(rank % i)
+            rank = rank // i
+        image = [0] * degree
+        tree  = _fenwick(degree + perm.PERM_BASE, perm.PERM_BASE)
+        for i in range(degree - 1, -1, -1):
+            # c_i larger images come before position i among i+1 left
+            x = tree.Find(i + 1 - digits[i])
+            image[i] = x
+            tree.Add(x, -1)
+        return self.FromImage(image)
+ 
+    def RankOn(self, points, degree):
+        """
+        points - list of k distinct points
+        degree - number of points
+ 
+        Returns the rank of the images of points among all k-tuples of
+        distinct points 1..degree, a dense index in 0..degree!/(degree-k)!-1
+        in mixed radix degree, degree-1, ... (see rank_images).
+        """
+        return rank_images([self[x] - perm.PERM_BASE for x in points], degree)
+ 
     def Cycles(self):
         """
         Returns internal permutation representation in
@@ -644,6 +888,568 @@ class perm:
         return points
  
  
+class frozenperm(perm):
+    """
+    Immutable and hashable permutation.
+ 
+    The images are stored as a tuple without trailing fixed points,
+    so equal permutations have the same internal representation and
+    the same hash regardless of the size they were created with.
+    Products and inverses of frozen permutations are frozen again,
+    which allows them to be used as dictionary keys and set elements
+    during searches.
+ 
+    Cycles, cycle counts, order and sign are computed together in a
+    single pass over the cycles the first time one of them is needed
+    and cached on the object.
+    """
+    __slots__ = ('_hash', '_cycles', '_counts', '_order', '_sign')
+ 
+    def __init__(self, *kargs):
+        perm.__init__(self, *kargs)
+        self._SetImage(self.p)
+ 
+    def _SetImage(self, p):
+        """
+        Internal command. Stores image list p in canonical form.
+        """
+        size = len(p)
+        while size > perm.PERM_BASE and p[size-1] == size-1:
+            size = size - 1
+        if size <= perm.PERM_BASE:
+            size = 0
+        self.p       = tuple(p[:size])
+        self.size    = size
+        self._hash   = hash(self.p)
+        self._cycles = None
+ 
+    def _Analyze(self):
+        """
+        Internal command. Walks the cycles once and caches the derived
+        values.
+        """
+        p      = self.p
+        cycles = []
+        counts = [0] * self.size
+        flags  = [False] * self.size
+        even   = 0
+        for i in range(perm.PERM_BASE, self.size):
+            if not flags[i]:
+                flags[i] = True
+                cycle    = [i]
+                j        = p[i]
+                while j != i:
+                    flags[j] = True
+                    cycle.append(j)
+                    j = p[j]
+                counts[len(cycle)] = counts[len(cycle)] + 1
+                if len(cycle) > 1:
+                    cycles.append(tuple(cycle))
+                if len(cycle) % 2 == 0:
+                    even = even + 1
+        self._counts = counts
+        self._order  = lcm([len(cyc) for cyc in cycles] + [1])
+        self._sign   = 1 - 2 * (even % 2)
+        if len(cycles) == 0:
+            cycles = [()]
+        self._cycles = cycles
+ 
+    def Cycles(self):
+        """
+        Returns the disjoint cycles, computed once.
+        """
+        if self._cycles is None:
+            self._Analyze()
+        return list(self._cycles)
+ 
+    def CycleCounts(self):
+        """
+        Returns counts of cycles, computed once.
+        """
+        if self._cycles is None:
+            self._Analyze()
+        return list(self._counts)
+ 
+    def Order(self):
+        """
+        Returns the order of the element, computed once.
+        """
+        if self._cycles is None:
+            self._Analyze()
+        return self._order
+ 
+    def Sign(self):
+        """
+        Returns the sign of the permutation, computed once.
+        """
+        if self._cycles is None:
+            self._Analyze()
+        return self._sign
+ 
+    def Pack(self):
+        """
+        Frozen permutations are always packed.
+        """
+        pass
+ 
+    def Freeze(self):
+        """
+        Returns self, which is already frozen.
+        """
+        return self
+ 
+    def Copy(self):
+        """
+        Returns self, there is no need to copy immutable objects.
+        """
+        return self
+ 
+    def Inverse(self):
+        """
+        Returns the frozen inverse of self.
+        """
+        return perm.Inverse(self).Freeze()
+ 
+    def IntPow(self, n):
+        """
+        n       integer power of permutation.
+ 
+        Returns a permutation of the same class as self.
+        """
+        result = perm.IntPow(self, n)
+        if type(result) != type(self):
+            result = type(self).from_image(result.p, validate = False)
+        return result
+ 
+    def __mul__(self, other):
+        """
+        Multiplication of two permutations, frozen if other is a
+        permutation.
+        """
+        result = perm.__mul__(self, other)
+        if isinstance(result, perm):
+            return result.Freeze()
+        return result
+ 
+    def __eq__(self, other):
+        """
+        Tests for equality, comparing the canonical tuples directly
+        if other is frozen too.
+        """
+        if isinstance(other, frozenperm):
+            return self._hash == other._hash and self.p == other.p
+        return perm.__eq__(self, other)
+ 
+    def __hash__(self):
+        return self._hash
+ 
+ 
+IDENTITY_BYTES = bytes(range(256))
+ 
+def image_bytes(p, size):
+    """
+    p     - a permutation of points below 256
+    size  - number of points
+ 
+    Returns the images of the points 0..size-1 under p as bytes, the
+    form the byte searches (problem1, extbfs, parallel) keep states in.
+    With size 256 it is a table for bytes.translate. Raises ValueError
+    if p moves a point of size or more.
+    """
+    if isinstance(p, byteperm):
+        if len(p.p) <= size:
+            return p.p + IDENTITY_BYTES[len(p.p):size]
+    elif p.size <= size:
+        return bytes([p[i] for i in range(size)])
+    if p.LargestMovedPoint() >= size:
+        raise ValueError("image_bytes(): the permutation moves points beyond %d" % (size - 1))
+    return bytes([p[i] for i in range(size)])
+ 
+class byteperm(frozenperm):
+    """
+    Immutable permutation of fewer than 256 points stored as bytes.
+ 
+    The same interface as frozenperm, but the images are kept in a
+    bytes object (one byte per point instead of a pointer to an int),
+    and products and inverses are computed in C by bytes.translate
+    and bytes.maketrans instead of a Python loop over the points.
+    Equal byteperm and frozenperm objects have equal hashes.
+ 
+    Ex.  b = byteperm.from_cycles([(1,2,3)])
+         b * byteperm(3,4)
+    """
+    __slots__ = ()
+ 
+    def _SetImage(self, p):
+        """
+        Internal command. Stores image list p in canonical form.
+        Raises ValueError for points above 255.
+        """
+        p    = bytes(p)
+        size = len(p)
+        while size > perm.PERM_BASE and p[size-1] == size-1:
+            size = size - 1
+        if size <= perm.PERM_BASE:
+            size = 0
+        self.p       = p[:size]
+        self.size    = size
+        self._hash   = None
+        self._cycles = None
+ 
+    @staticmethod
+    def _FromBytes(p):
+        result = byteperm.__new__(byteperm)
+        result._SetImage(p)
+        return result
+ 
+    def Inverse(self):
+        """
+        Returns the inverse of self.
+        """
+        p = self.p
+        return byteperm._FromBytes(bytes.maketrans(p, IDENTITY_BYTES[:len(p)])[:len(p)])
+ 
+    def __mul__(self, other):
+        """
+        Multiplication of two permutations by byte translation.
+        """
+        if not isinstance(other, perm):
+            return self.Image(other)
+        a = self.p
+        if isinstance(other, byteperm):
+            b = other.p
+        elif isinstance(other, sparseperm):
+            b = bytes([other[i] for i in range(other.size)])
+        else:
+            b = bytes(other.p)
+        size = max(len(a), len(b))
+        if perm.EVAL_ORDER == 0:  # right to left
+            a, b = b, a
+        # r[i] = b[a[i]]
+        a = a + IDENTITY_BYTES[len(a):size]
+        return byteperm._FromBytes(a.translate(b + IDENTITY_BYTES[len(b):]))
+ 
+    def Image(self, pt):
+        """
+        Returns the image of a point(s) under self; bytes are mapped
+        by a single translation.
+        """
+        if isinstance(pt, (bytes, bytearray)):
+            return pt.translate(self.p + IDENTITY_BYTES[len(self.p):])
+        return perm.Image(self, pt)
+ 
+    def __eq__(self, other):
+        """
+        Tests for equality.
+        """
+        if isinstance(other, byteperm):
+            return self.p == other.p
+        if isinstance(other, frozenperm):
+            return tuple(self.p) == other.p
+        return perm.__eq__(self, other)
+ 
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(tuple(self.p))
+        return self._hash
+ 
+ 
+SPARSE_RATIO = 4  # a dict entry takes about 4 times the memory of a list slot
+ 
+class sparseperm(perm):
+    """
+    Permutation storing only its moved points, for large degrees.
+ 
+    The images are kept in a dict {point: image} of the moved points,
+    and size is the largest moved point plus one, as for perm. Products
+    of two sparse permutations walk the union of their supports instead
+    of all points up to the larger size, inverses and cycles walk the
+    support only. Mixed products with a dense permutation are dense;
+    sparse * dense copies the image list of the dense factor and
+    changes the points of the support.
+ 
+    compact(p) chooses the cheaper form for p, and the product of two
+    sparse permutations is sparse only if it moves fewer than
+    size/SPARSE_RATIO points.
+ 
+    Ex.  s = sparseperm.from_cycles([(1,10**6)])
+         s * sparseperm(2,3)
+         s.Dense()
+    """
+    __slots__ = ()
+ 
+    def __init__(self, *kargs):
+        """
+        Accepts the arguments of perm(), a cycle or a list of cycles
+        or transpositions, and composes them in time proportional to
+        their number of points, without an image list.
+        """
+        if len(kargs) == 1 and type(kargs[0]) in [list, tuple]:
+            newkargs = list(kargs[0])
+        else:
+            newkargs = [y for y in kargs if not (type(y) in [list, tuple] and len(y) == 0)]
+        images = {}
+        if len(newkargs) > 0 and seq.MinElt(newkargs) >= perm.PERM_BASE:
+            if seq.IsAllIntegers(newkargs):
+                cycles = [newkargs]
+            elif seq.IsAllSequences(newkargs):
+                cycles = [list(y) for y in newkargs if len(y) > 0]
+            else:
+                print("__init__() error: undefined type, returning identity.")
+                cycles = []
+            for cycle in cycles:
+                if len(set(cycle)) != len(cycle):
+                    print("__init__() error: invalid permutation.")
+                    images = {}
+                    break
+                images = _Compose(images, dict(zip(cycle, cycle[1:] + cycle[:1])))
+        self._SetDict(images)
+ 
+    @classmethod
+    def from_cycles(cls, cycles, size = None, validate = True):
+        """
+        cycles   - sequence of disjoint cycles
+        size     - ignored, the size follows from the moved points
+        validate - check that the cycles are disjoint and their points
+                   are at least PERM_BASE
+ 
+        Returns a sparse permutation built in time proportional to the
+        number of points of the cycles. Raises ValueError if validation
+        fails.
+        """
+        images = {}
+        for cycle in cycles:
+            for k in range(len(cycle)):
+                x = cycle[k]
+                if validate and (x < perm.PERM_BASE or x in images):
+                    raise ValueError("sparseperm.from_cycles(): cycles are not disjoint cycles of valid points")
+                images[x] = cycle[(k + 1) % len(cycle)]
+        return cls._FromDict(images)
+ 
+    @classmethod
+    def _FromDict(cls, images):
+        """
+        Internal command. Returns a permutation with the image dict
+        images, from which the fixed points are removed.
+        """
+        result = cls.__new__(cls)
+        result._SetDict(images)
+        return result
+ 
+    def _SetDict(self, images):
+        """
+        Internal command. Stores the images of the moved points.
+        """
+        self.p    = dict([(x, y) for x, y in images.items() if x != y])
+        self.size = max(self.p) + 1 if self.p else 0
+ 
+    def _SetImage(self, p):
+        """
+        Internal command. Stores the moved points of image list p.
+        """
+        self._SetDict(dict([(x, p[x]) for x in range(perm.PERM_BASE, len(p)) if p[x] != x]))
+ 
+    def __getitem__(self, i):
+        return self.p.get(i, i)
+ 
+    def ToImage(self):
+        """
+        Returns the image array of the points PERM_BASE..size-1.
+        """
+        return [self[i] for i in range(perm.PERM_BASE, self.size)]
+ 
+    def Identity(self, size = 0):
+        """
+        Returns the identity, which stores no points whatever the size.
+        """
+        return sparseperm()
+ 
+    def IsIdentity(self):
+        return len(self.p) == 0
+ 
+    def IsPermutation(self):
+        """
+        Returns True if the moved points are mapped 1-1 onto themselves.
+        """
+        return set(self.p.values()) == set(self.p)
+ 
+    def Pack(self):
+        """
+        Sparse permutations are always packed.
+        """
+        pass
+ 
+    def Copy(self):
+        return sparseperm._FromDict(self.p)
+ 
+    def Sparse(self):
+        return self.Copy()
+ 
+    def Dense(self):
+        """
+        Returns self as a dense perm.
+        """
+        result = perm()
+        p = list(range(self.size))
+        for x, y in self.p.items():
+            p[x] = y
+        result._SetImage(p)
+        return result
+ 
+    def Freeze(self):
+        return self.Dense().Freeze()
+ 
+    def Inverse(self):
+        """
+        Returns the inverse, walking the moved points only.
+        """
+        return sparseperm._FromDict(dict([(y, x) for x, y in self.p.items()]))
+ 
+    def __mul__(self, other):
+        """
+        Multiplication of two permutations. The product of two sparse
+        permutations is computed on the union of their supports and
+        returned in the cheaper form (see compact); a product with a
+        dense permutation is dense.
+        """
+        if not isinstance(other, perm):
+            return self.Image(other)
+        if perm.EVAL_ORDER == 0:  # right to left
+            return _SparseProduct(other, self)
+        return _SparseProduct(self, other)
+ 
+    def __rmul__(self, other):
+        """
+        Multiplication other * self of a dense permutation other.
+        """
+        if not isinstance(other, perm):
+            return NotImplemented
+        if perm.EVAL_ORDER == 0:  # right to left
+            return _SparseProduct(self, other)
+        return _SparseProduct(other, self)
+ 
+    def __eq__(self, other):
+        """
+        Tests for equality, comparing the dicts directly if other is
+        sparse too.
+        """
+        if isinstance(other, sparseperm):
+            return self.p == other.p
+        return perm.__eq__(self, other)
+ 
+    __hash__ = None
+ 
+    def Cycles(self):
+        """
+        Returns the disjoint cycles, walking the moved points only.
+        """
+        cycles = []
+        seen   = set()
+        for i in sorted(self.p):
+            if i not in seen:
+                cycle = [i]
+                seen.add(i)
+                j = self.p[i]
+                while j != i:
+                    seen.add(j)
+                    cycle.append(j)
+                    j = self.p[j]
+                cycles.append(tuple(cycle))
+        if len(cycles) == 0:
+            return [()]
+        return cycles
+ 
+    def CycleCounts(self):
+        """
+        Returns counts of cycles in permutation, see perm.CycleCounts.
+        """
+        counts = [0] * self.size
+        if self.size == 0:
+            return counts
+        counts[1] = self.size - perm.PERM_BASE - len(self.p)
+        for cycle in self.Cycles():
+            counts[len(cycle)] = counts[len(cycle)] + 1
+        return counts
+ 
+    def Sign(self):
+        """
+        Returns the sign from the moved points only: a cycle of length
+        l is a product of l-1 transpositions.
+        """
+        if not self.p:
+            return 1
+        if (len(self.p) - len(self.Cycles())) % 2 == 0:
+            return 1
+        return -1
+ 
+    def LargestMovedPoint(self):
+        if not self.p:
+            return -1
+        return self.size - 1
+ 
+    def SmallestMovedPoint(self):
+        if not self.p:
+            return -1
+        return min(self.p)
+ 
+    def NrMovedPoints(self):
+        return len(self.p)
+ 
+    def MovedPoints(self):
+        return sorted(self.p)
+ 
+ 
+def _Compose(a, b):
+    """
+    Internal command. Returns the dict r with r[i] = b[a[i]] of the
+    image dicts a and b, on the union of their keys.
+    """
+    images = {}
+    for x, y in a.items():
+        images[x] = b.get(y, y)
+    for x, y in b.items():
+        if x not in a:
+            images[x] = y
+    return images
+ 
+def _SparseProduct(a, b):
+    """
+    Internal command. Returns r with r[i] = b[a[i]] where a or b is
+    sparse.
+    """
+    if isinstance(a, sparseperm) and isinstance(b, sparseperm):
+        return compact(sparseperm._FromDict(_Compose(a.p, b.p)))
+    result = perm()
+    if isinstance(a, sparseperm):
+        # the dense image of b, changed on the moved points of a
+        size = max(a.size, b.size)
+        r = list(b.p[:size]) + list(range(len(b.p), size))
+        for x, y in a.p.items():
+            r[x] = b[y]
+    else:
+        get = b.p.get
+        r = [get(y, y) for y in a.p] + [get(y, y) for y in range(len(a.p), b.size)]
+    result._SetImage(r)
+    return result
+ 
+def compact(p):
+    """
+    p   - a permutation
+ 
+    Returns p in the cheaper form: sparse if it moves fewer than
+    p.size/SPARSE_RATIO points, else dense. The sparse and the dense
+    form of the same permutation are equal.
+    """
+    if isinstance(p, sparseperm):
+        if len(p.p) * SPARSE_RATIO < p.size:
+            return p
+        return p.Dense()
+    moved = p.NrMovedPoints()
+    if moved * SPARSE_RATIO < p.size:
+        return p.Sparse()
+    return p
+ 
+ 
 def Test():
     print("TestPerm() Version 0.1.1")
  
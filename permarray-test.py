@@ -0,0 +1,47 @@
+from permarray import permarray
+from perm import perm
+import base
+import unittest
+
+class Test(unittest.TestCase):
+    def test_round_trip(self):
+        a = permarray(base.B)
+        self.assertEqual(6, len(a))
+        self.assertEqual(base.N+1, a.size)
+        self.assertEqual(base.B, a.ToPerms())
+    def test_apply(self):
+        states = [base.b0, base.b1*base.b2, base.b0.Identity()]
+        a = permarray(states, base.N+1).Apply(base.b3)
+        for k in range(len(states)):
+            self.assertEqual(base.b3*states[k], a[k])
+    def test_expand(self):
+        states = [base.b0, base.b4*base.b5]
+        a = permarray(states, base.N+1).Expand(base.B)
+        self.assertEqual(len(states)*len(base.B), len(a))
+        for row in range(len(a)):
+            k, j = divmod(row, len(base.B))
+            self.assertEqual(base.B[j]*states[k], a[row])
+    def test_is_identity(self):
+        a = permarray([base.b0*base.b0*base.b0], base.N+1).Expand(base.B)
+        self.assertEqual([0], list(a.IsIdentity().nonzero()[0]))
+    def test_unique(self):
+        a = permarray([base.b0], base.N+1).Expand(base.B).Expand(base.B)
+        u, index = a.Unique()
+        self.assertEqual(len(set(a.Keys())), len(u))
+        self.assertEqual(0, index[0])
+    def test_generator_too_large(self):
+        with self.assertRaises(ValueError):
+            permarray([perm(1,2)]).Apply(base.b0)
+    def test_right_to_left(self):
+        perm.EVAL_ORDER = 0
+        try:
+            a = permarray([base.b0, base.b1], base.N+1).Expand([base.b2])
+            self.assertEqual(base.b2*base.b0, a[0])
+            self.assertEqual(base.b2*base.b1, a[1])
+        finally:
+            perm.EVAL_ORDER = 1
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
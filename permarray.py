@@ -0,0 +1,147 @@
+"""
+File    permarray.py
+
+Description
+    Batched composition of permutations using NumPy.
+
+    A permarray holds many permutations of the same size as the rows
+    of a 2-D integer array. As in perm, column i is the image of point
+    i and column 0 is the unused point 0, so for the cube the array has
+    base.N+1 = 55 columns. Multiplying a whole search frontier by a
+    generator, or by every generator of a list at once, is a single
+    fancy-indexing operation instead of one perm.__mul__ call per state.
+
+    The products follow perm.EVAL_ORDER, i.e. row k of
+    frontier.Apply(g) equals g * frontier[k].
+
+Example
+    >>> frontier = permarray([base.b0], base.N+1)
+    >>> frontier = frontier.Expand(base.B)     # 6 states
+    >>> frontier = frontier.Expand(base.B)     # 36 states
+    >>> frontier.IsIdentity().nonzero()
+"""
+import numpy
+from perm import perm, frozenperm
+
+
+def _dtype(size):
+    if size <= 256:
+        return numpy.uint8
+    return numpy.int32
+
+def _image(p, size):
+    return [p[i] for i in range(size)]
+
+
+class permarray:
+    """
+    Array of permutations of equal size supporting batched products.
+    """
+
+    def __init__(self, perms=(), size=None):
+        """
+        perms - sequence of perm objects
+        size  - number of columns, by default the largest perm size;
+                it must exceed every point moved by the generators
+                applied later (base.N+1 for the cube)
+
+        permarray([base.b0, base.b1])      two rows of 55 points
+        permarray([], 55)                  empty array of 55 points
+        """
+        perms = list(perms)
+        if size is None:
+            size = max([p.size for p in perms] + [perm.PERM_BASE + 1])
+        self.size = size
+        self.a = numpy.array([_image(p, size) for p in perms],
+                             dtype=_dtype(size)).reshape(len(perms), size)
+
+    @staticmethod
+    def FromArray(a):
+        """
+        Returns a permarray sharing the 2-D image array a. The rows are
+        not checked to be permutations.
+        """
+        result = permarray((), a.shape[1])
+        result.a = a
+        return result
+
+    def __len__(self):
+        return self.a.shape[0]
+
+    def __getitem__(self, k):
+        """
+        Returns row k as a frozen permutation, or a permarray if k is a
+        slice, a boolean mask or an index array.
+        """
+        if isinstance(k, (int, numpy.integer)):
+            return frozenperm.from_image(self.a[k].tolist(), validate=False)
+        return permarray.FromArray(self.a[k])
+
+    def ToPerms(self):
+        """
+        Returns the rows as a list of frozen permutations.
+        """
+        return [self[k] for k in range(len(self))]
+
+    def _Generators(self, gens):
+        for g in gens:
+            if g.LargestMovedPoint() >= self.size:
+                raise ValueError("permarray: generator moves points beyond size %d" % self.size)
+        return numpy.array([_image(g, self.size) for g in gens],
+                           dtype=numpy.intp).reshape(len(gens), self.size)
+
+    def Apply(self, g):
+        """
+        g - permutation
+
+        Returns the permarray of products g * row for all rows.
+        """
+        gi = self._Generators([g])[0]
+        if perm.EVAL_ORDER == 0:  # right to left
+            return permarray.FromArray(gi[self.a].astype(self.a.dtype))
+        return permarray.FromArray(self.a[:, gi])
+
+    def Expand(self, gens):
+        """
+        gens - list of permutations
+
+        Returns the permarray of all products gens[j] * row. Row
+        k*len(gens)+j of the result is gens[j] * self[k], so the
+        parent and the move index of a row are divmod(row, len(gens)).
+        """
+        G = self._Generators(gens)
+        if perm.EVAL_ORDER == 0:  # right to left
+            r = G[:, self.a].transpose(1, 0, 2).astype(self.a.dtype)
+        else:
+            r = self.a[:, G]
+        return permarray.FromArray(r.reshape(-1, self.size))
+
+    def IsIdentity(self):
+        """
+        Returns a boolean array telling which rows are the identity.
+        """
+        identity = numpy.arange(self.size, dtype=self.a.dtype)
+        return (self.a == identity).all(axis=1)
+
+    def Unique(self):
+        """
+        Returns (u, index) where u holds the distinct rows of self in
+        order of their first occurrence and index their row numbers.
+        """
+        if len(self) == 0:
+            return self, numpy.zeros(0, dtype=numpy.intp)
+        rows = numpy.ascontiguousarray(self.a).view(
+            numpy.dtype((numpy.void, self.a.dtype.itemsize * self.size)))
+        _, index = numpy.unique(rows.ravel(), return_index=True)
+        index.sort()
+        return permarray.FromArray(self.a[index]), index
+
+    def Keys(self):
+        """
+        Returns the rows as bytes objects, usable as dictionary keys
+        or set elements.
+        """
+        a = numpy.ascontiguousarray(self.a)
+        return [row.tobytes() for row in a]
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
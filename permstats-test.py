@@ -0,0 +1,45 @@
+import base
+import permstats
+import random
+import unittest
+from perm import perm
+from permarray import permarray
+from stabchain import stabchain
+
+class Test(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        G = stabchain(base.B)
+        self.perms = [G.Random(rng) for i in range(50)] + [base.b0, base.b1*base.b2]
+        self.states = permarray(self.perms, base.N+1)
+    def test_cycle_lengths(self):
+        lengths = permstats.cycle_lengths(permarray([perm((1,2),(3,4,5))], 7))
+        self.assertEqual([1, 2, 2, 3, 3, 3, 1], list(lengths[0]))
+    def test_cycle_types(self):
+        types = permstats.cycle_types(self.states)
+        for k in range(len(self.perms)):
+            p = perm.from_image([self.perms[k][i] for i in range(base.N+1)])
+            self.assertEqual(p.CycleCounts(), list(types[k]))
+    def test_orders(self):
+        orders = permstats.orders(self.states)
+        self.assertEqual([p.Order() for p in self.perms], list(orders))
+        self.assertEqual([1], list(permstats.orders(permarray([base.b0.Identity()], base.N+1))))
+        self.assertEqual(1, base.b0.Identity().Order())
+    def test_signs(self):
+        signs = permstats.signs(self.states)
+        self.assertEqual([p.Sign() for p in self.perms], list(signs))
+    def test_analyze(self):
+        types, orders, signs = permstats.analyze(self.states.a)
+        self.assertTrue((types == permstats.cycle_types(self.states)).all())
+        self.assertTrue((orders == permstats.orders(self.states)).all())
+        self.assertTrue((signs == permstats.signs(self.states)).all())
+    def test_large_degree(self):
+        p = perm(tuple(range(1, 200)), tuple(range(200, 301)))
+        a = permarray([p], 301)
+        self.assertEqual([199*101], list(permstats.orders(a)))
+        self.assertEqual([1], list(permstats.signs(a)))
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
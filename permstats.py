@@ -0,0 +1,105 @@
+"""
+File    permstats.py
+
+Description
+    Cycle types, orders and signs of many permutations using NumPy.
+
+    The functions take a permarray (or its 2-D array, one permutation
+    per row, column i the image of point i, column 0 the unused point
+    0) and return one result per row. The cycles of all rows are found
+    at once by pointer jumping, log2(size) fancy-indexing steps, so the
+    work is a small number of array operations instead of a Python loop
+    per element.
+
+    cycle_types(a)[k] is perm.CycleCounts() of row k, orders use a
+    Euclidean lcm reduction (numpy.lcm) and signs are +1 or -1.
+
+Example
+    >>> states = permarray([G.Random() for i in range(100000)], base.N+1)
+    >>> types, orders, signs = analyze(states)
+    >>> numpy.bincount(orders)
+"""
+import numpy
+import mathutils
+
+
+def _array(a):
+    if hasattr(a, 'a'):
+        return a.a
+    return numpy.asarray(a)
+
+def cycle_lengths(a):
+    """
+    Returns the array of the lengths of the cycle through every point
+    (column 0 included) of every row of a.
+    """
+    a = _array(a)
+    n, size = a.shape
+    # label every point with the smallest point of its cycle by pointer
+    # jumping: after k steps label[x] is the minimum of x, a(x), ...,
+    # a^(2^k-1)(x) and jump = a^(2^k)
+    label = numpy.tile(numpy.arange(size, dtype=a.dtype), (n, 1))
+    jump = a
+    steps = 1
+    while steps < size:
+        label = numpy.minimum(label, numpy.take_along_axis(label, jump, axis=1))
+        jump = numpy.take_along_axis(jump, jump, axis=1)
+        steps = 2*steps
+    # the length of a cycle is the number of points with its label
+    rows = numpy.arange(n, dtype=numpy.int64).reshape(n, 1)*size
+    counts = numpy.bincount((rows + label).ravel(), minlength=n*size)
+    return counts.reshape(n, size)[numpy.arange(n).reshape(n, 1), label].astype(numpy.int32)
+
+def _cycle_types(lengths):
+    n, size = lengths.shape
+    # number of points on cycles of each length, divided by the length
+    rows = numpy.arange(n, dtype=numpy.int64).reshape(n, 1)*size
+    points = numpy.bincount((rows + lengths[:, 1:]).ravel(), minlength=n*size).reshape(n, size)
+    types = numpy.zeros((n, size), dtype=numpy.int32)
+    types[:, 1:] = points[:, 1:] // numpy.arange(1, size)
+    return types
+
+def _orders(lengths):
+    if lengths.shape[1] <= 256:
+        # the order of a permutation of at most 255 points fits in 64 bits
+        return numpy.lcm.reduce(lengths[:, 1:].astype(numpy.int64), axis=1)
+    return numpy.array([mathutils.lcm([int(x) for x in numpy.unique(row[1:])])
+                        for row in lengths], dtype=object)
+
+def _signs(types):
+    # a cycle of length l is a product of l-1 transpositions
+    size = types.shape[1]
+    transpositions = (size - 1) - types.sum(axis=1)
+    return numpy.where(transpositions % 2 == 0, 1, -1).astype(numpy.int8)
+
+def cycle_types(a):
+    """
+    Returns the array of cycle counts, row k column l the number of
+    cycles of length l of permutation k (fixed points are cycles of
+    length 1, column 0 is always 0).
+    """
+    return _cycle_types(cycle_lengths(a))
+
+def orders(a):
+    """
+    Returns the orders of the permutations (int64, or Python integers
+    for more than 256 points).
+    """
+    return _orders(cycle_lengths(a))
+
+def signs(a):
+    """
+    Returns the signs of the permutations, 1 for even, -1 for odd ones.
+    """
+    return _signs(cycle_types(a))
+
+def analyze(a):
+    """
+    Returns (cycle_types(a), orders(a), signs(a)) computing the cycle
+    lengths once.
+    """
+    lengths = cycle_lengths(a)
+    types = _cycle_types(lengths)
+    return types, _orders(lengths), _signs(types)
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
@@ -0,0 +1,60 @@
+import base
+import problem1
+import searchstats
+import unittest
+
+class Test(unittest.TestCase):
+    def test_breath_search(self):
+        a = (base.b0*base.b5*base.b3).Inverse()
+        moves = problem1.breath_search(a)
+        self.assertEqual(3, len(moves))
+        self.assertTrue(base.apply_moves(a, moves).IsIdentity())
+    def test_breath_search_identity(self):
+        self.assertEqual([], problem1.breath_search(base.b0.Identity()))
+    def test_breath_search_deep(self):
+        # deeper than the four levels of states kept
+        a = (base.b0*base.b5*base.b3*base.b0*base.b1*base.b2).Inverse()
+        moves = problem1.breath_search(a)
+        self.assertEqual(6, len(moves))
+        self.assertTrue(base.apply_moves(a, moves).IsIdentity())
+    def test_bidirectional_search_identity(self):
+        self.assertEqual([], problem1.bidirectional_search(base.b0.Identity()))
+    def test_bidirectional_search_matches_breath_search(self):
+        a = (base.b0*base.b5*base.b3*base.b0).Inverse()
+        moves = problem1.bidirectional_search(a)
+        self.assertEqual(len(problem1.breath_search(a)), len(moves))
+        self.assertTrue(base.apply_moves(a, moves).IsIdentity())
+    def test_bidirectional_search_deep(self):
+        a = (base.b0*base.b5*base.b3*base.b0*base.b1*base.b2*base.b4).Inverse()
+        moves = problem1.bidirectional_search(a)
+        self.assertTrue(len(moves) <= 7)
+        self.assertTrue(base.apply_moves(a, moves).IsIdentity())
+    def test_breath_search_steps(self):
+        a = (base.b0*base.b5*base.b3).Inverse()
+        events = list(problem1.breath_search_steps(a))
+        solutions = [e[1] for e in events if e[0] == 'solution']
+        self.assertTrue(len(solutions) >= 1)
+        for moves in solutions:
+            self.assertEqual(3, len(moves))
+            self.assertTrue(base.apply_moves(a, moves).IsIdentity())
+        self.assertEqual(('progress', 3), events[-1][:2])
+    def test_breath_search_steps_shares_breath_search(self):
+        a = (base.b0*base.b5*base.b3*base.b0).Inverse()
+        stats = searchstats.searchstats()
+        events = list(problem1.breath_search_steps(a, stats=stats))
+        solutions = [e[1] for e in events if e[0] == 'solution']
+        self.assertEqual(problem1.breath_search(a), solutions[0])
+        # all states of the last level are expanded, the identity is
+        # generated once per solution and not stored
+        self.assertEqual(6*stats.expanded, stats.generated)
+        self.assertEqual(stats.generated - stats.duplicates - len(solutions) + 1, stats.stored)
+    def test_breath_search_steps_identity(self):
+        self.assertEqual([('solution', [])], list(problem1.breath_search_steps(base.b0.Identity())))
+    def test_breath_search_steps_max_depth(self):
+        events = list(problem1.breath_search_steps(base.b0*base.b2, max_depth=1))
+        self.assertEqual([('progress', 1, 1)], events)
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
@@ -2,26 +2,224 @@
 Description:
   given the initial state of the cube turned a small number of times
   try to find a list of base permutations to solve it exactly; works! :-)
+
+  both searches never expand a state twice. they fill in the counters
+  of stats, a searchstats.searchstats object, if one is given.
+
+  breath_search keeps one level at a time: the states in one bytearray
+  of W-byte records (the images of the points 0..base.N, multiplied by
+  bytes.translate), and for every state the index of its parent in the
+  level before and the move leading to it. only the parent indices and
+  moves (5 bytes per state) of finished levels are kept, from which the
+  moves of the solution are read off at the end, and only the states of
+  the last four levels are kept to recognize repeated states, since a
+  state b*x is never more than three levels above x (b^-1 = b^3). with
+  symmetries the keys of those states are their canonical images, W
+  bytes as well.
+
+  given symmetries (e.g. symmetry.BASE_SYMMETRIES), breath_search keeps
+  only one state of every class of conjugate states, which are equally
+  far from the identity, so the visited set shrinks by up to the number
+  of symmetries.
+
+  breath_search grows a single tree from the scrambled state.
+  bidirectional_search grows one level-by-level frontier from the
+  scrambled state and one from the identity (using the inverses of the
+  base permutations) and joins them as soon as they meet, so a depth d
+  solution costs about 2*6^(d/2) instead of 6^d expansions.
+
+  parallel.parallel_breath_search finds solutions of the same length
+  using several processes.
+
+  breath_search_steps is the search itself, as a generator for callers
+  that must not block until the end (see asyncsearch.py); breath_search
+  returns its first solution. it yields
+
+    ('progress', depth, nodes)  every report expanded states and after
+                                each finished depth
+    ('solution', moves)         every shortest solution found, i.e. one
+                                for each state of the previous depth and
+                                base permutation reaching the identity
+
+  and stops after the depth of the first solutions or at max_depth.
 """
-from perm import perm
+import time
+from array import array
+from perm import perm, IDENTITY_BYTES, image_bytes
 import base
+import symmetry
+
+W = base.N+1
+
+def _path(parents, moves, k):
+    # moves leading to state k of the last level
+    path = []
+    for d in range(len(parents)-1, -1, -1):
+        path.append(moves[d][k])
+        k = parents[d][k]
+    path.reverse()
+    return path
+
+def breath_search(a, stats=None, symmetries=None):
+    for event in breath_search_steps(a, None, None, stats, symmetries):
+        if event[0] == 'solution':
+            return event[1]
+    return None
+
+def breath_search_steps(a, max_depth=20, report=10000, stats=None, symmetries=None):
+    start = image_bytes(a, W)
+    identity = IDENTITY_BYTES[:W]
+    if start == identity:
+        yield ('solution', [])
+        return
+    canonical = None
+    if symmetries is not None:
+        symmetry.check_moves(symmetries, base.B)
+        canonical = symmetry.canonizer(symmetries).Key
+    gens = [image_bytes(b, W) for b in base.B]
+    pad = IDENTITY_BYTES[W:]
+    # keys of the states of the last levels, W-byte records; a state
+    # b*x is at most 3 levels above x (b^-1 = b^3), so older levels
+    # cannot recur
+    start_key = start if canonical is None else canonical(start)[:W]
+    visited = set([start_key])
+    level_keys = [bytearray(start_key)]
+    # the states of a level, W-byte records
+    level = bytearray(start)
+    parents = []
+    moves = []
+    nodes = 0
+    depth = 0
+    while level and (max_depth is None or depth < max_depth):
+        depth += 1
+        size = len(level)//W
+        if stats is not None:
+            stats.Level(size)
+        next_level = bytearray()
+        if canonical is None:
+            next_keys = next_level
+        else:
+            next_keys = bytearray()
+        next_parents = array('I')
+        next_moves = bytearray()
+        found = 0
+        # counts of the level already added to stats
+        counted = (0, 0, 0)
+        for k in range(size):
+            table = level[k*W:(k+1)*W] + pad
+            for j in range(len(gens)):
+                # (b*state)[i] = state[b[i]]
+                new_state = gens[j].translate(table)
+                if new_state == identity:
+                    found += 1
+                    if stats is not None:
+                        # the caller may stop at this solution
+                        counted = _count(stats, counted, k+1, k*len(gens)+j+1,
+                                         len(next_moves)+found)
+                        stats.Store(len(visited))
+                    yield ('solution', _path(parents, moves, k) + [j])
+                    continue
+                new_key = new_state if canonical is None else canonical(new_state)[:W]
+                if new_key not in visited:
+                    visited.add(new_key)
+                    if canonical is not None:
+                        next_keys += new_key
+                    next_level += new_state
+                    next_parents.append(k)
+                    next_moves.append(j)
+            nodes += 1
+            if report and nodes % report == 0:
+                yield ('progress', depth, nodes)
+        if stats is not None:
+            _count(stats, counted, size, size*len(gens), len(next_moves)+found)
+            stats.Store(len(visited))
+        yield ('progress', depth, nodes)
+        if found:
+            return
+        parents.append(next_parents)
+        moves.append(next_moves)
+        level = next_level
+        level_keys.append(next_keys)
+        if len(level_keys) > 4:
+            keys = level_keys.pop(0)
+            visited.difference_update([bytes(keys[i:i+W]) for i in range(0, len(keys), W)])
+
+def _count(stats, counted, expanded, generated, new):
+    # adds the counts of a level beyond those counted already and
+    # returns the new counted; the identity is new, not a duplicate
+    stats.expanded += expanded - counted[0]
+    stats.generated += generated - counted[1]
+    stats.duplicates += (generated - new) - (counted[1] - counted[2])
+    return (expanded, generated, new)
 
-def breath_search(a):
-    queue = [([],a)]
-    i = 0
-    while True:
-        moves, state = queue[i]
-        i += 1
-        if state.IsIdentity():
-            return moves
-        j = 0
-        for b in base.B:
-            queue.append((moves+[j],b*state))
-            j += 1
+def bidirectional_search(a, stats=None):
+    if a.IsIdentity():
+        return []
+    a = a.Freeze()
+    identity = a.Identity().Freeze()
+    inverses = [b.Inverse() for b in base.B]
+    # state -> moves; forward moves lead from a to the state,
+    # backward moves lead from the state to the identity
+    forward = {a: []}
+    backward = {identity: []}
+    forward_level = [a]
+    backward_level = [identity]
+    while forward_level and backward_level:
+        if len(forward_level) <= len(backward_level):
+            side, level, seen, other, gens = 'forward', forward_level, forward, backward, base.B
+        else:
+            side, level, seen, other, gens = 'backward', backward_level, backward, forward, inverses
+        start = time.time()
+        next_level = []
+        found = None
+        expanded = 0
+        for state in level:
+            expanded += 1
+            moves = seen[state]
+            for j in range(len(gens)):
+                new_state = gens[j]*state
+                if new_state in seen:
+                    continue
+                if side == 'forward':
+                    new_moves = moves+[j]
+                else:
+                    new_moves = [j]+moves
+                if new_state in other:
+                    if side == 'forward':
+                        found = new_moves+other[new_state]
+                    else:
+                        found = other[new_state]+new_moves
+                    break
+                seen[new_state] = new_moves
+                next_level.append(new_state)
+            if found is not None:
+                break
+        if stats is not None:
+            generated = expanded*len(gens)
+            new = len(next_level)
+            if found is not None:
+                # only the moves 0..j of the last state were generated,
+                # the last one reaching the other side
+                generated = generated - len(gens) + j+1
+                new = new + 1
+            stats.AddTime(side, time.time()-start)
+            stats.expanded += expanded
+            stats.generated += generated
+            stats.duplicates += generated - new
+            stats.Store(len(forward)+len(backward))
+            stats.Level(len(next_level))
+        if found is not None:
+            return found
+        if side == 'forward':
+            forward_level = next_level
+        else:
+            backward_level = next_level
+    return None
 
 if __name__ == '__main__':
     print(breath_search((base.b0)))
     print(breath_search((base.b0*base.b5*base.b3*base.b0).Inverse()))
     print(breath_search((base.b0*base.b5*base.b3*base.b0*base.b1).Inverse()))
+    print(bidirectional_search((base.b0*base.b5*base.b3*base.b0*base.b1*base.b2*base.b4).Inverse()))
 
 # vim:expandtab:softtabstop=4:shiftwidth=4
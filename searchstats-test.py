@@ -0,0 +1,84 @@
+import base
+import ida
+import os
+import problem1
+import pstats
+import searchstats
+import tempfile
+from transtable import transtable
+import unittest
+
+class Test(unittest.TestCase):
+    def test_breath_search(self):
+        a = (base.b0*base.b5*base.b3).Inverse()
+        levels = []
+        moves, stats = searchstats.solve(problem1.breath_search, a,
+                                         lambda s: levels.append(s.frontier[-1]))
+        self.assertEqual(problem1.breath_search(a), moves)
+        self.assertEqual([1, 6], stats.frontier[:2])
+        self.assertEqual(stats.frontier, levels)
+        self.assertTrue(6*(stats.expanded-1) < stats.generated <= 6*stats.expanded)
+        # the identity is generated but not stored
+        self.assertEqual(stats.generated - stats.duplicates, stats.stored)
+        self.assertTrue(stats.elapsed > 0)
+        self.assertTrue(stats.AsDict()['nodes_per_sec'] > 0)
+    def test_bidirectional_search(self):
+        a = (base.b0*base.b5*base.b3*base.b0*base.b1).Inverse()
+        moves, stats = searchstats.solve(problem1.bidirectional_search, a)
+        self.assertEqual(len(problem1.breath_search(a)), len(moves))
+        self.assertEqual(set(['forward', 'backward']), set(stats.phases))
+        self.assertEqual(len(stats.frontier), len(moves))
+        self.assertTrue(stats.expanded > 0)
+    def test_bidirectional_partial_level(self):
+        # the frontiers meet at the fifth move of the 182nd state of the
+        # last level of 975 states
+        a = base.b1*base.b4*base.b2
+        moves, stats = searchstats.solve(problem1.bidirectional_search, a)
+        self.assertEqual(9, len(moves))
+        self.assertEqual(2*(1+6+33+180) + 182, stats.expanded)
+        self.assertEqual(6*(stats.expanded-1) + 5, stats.generated)
+        # the start, the identity and the new states are stored, the
+        # state where the frontiers meet is generated but not stored
+        self.assertEqual(stats.generated - stats.duplicates, stats.stored - 2 + 1)
+    def test_ida_search(self):
+        a = (base.b0*base.b5*base.b3).Inverse()
+        moves, stats = searchstats.solve(ida.ida_search, a)
+        self.assertEqual(ida.ida_search(a), moves)
+        self.assertEqual(sum(stats.frontier), stats.generated)
+        # the nodes cut off by the bound are generated, not expanded
+        self.assertTrue(0 < stats.expanded < stats.generated)
+        self.assertEqual(0, stats.duplicates)
+        self.assertEqual(['bound 0', 'bound 1', 'bound 2', 'bound 3'], sorted(stats.phases))
+    def test_ida_search_table(self):
+        a = (base.b0*base.b5*base.b3).Inverse()
+        table = transtable(memory=2**20)
+        moves, first = searchstats.solve(ida.ida_search, a, table=table)
+        # the bound learned by the first search for the start state
+        # skips the failed iterations of the second one, and those for
+        # the other states cut off most of what is left
+        moves, stats = searchstats.solve(ida.ida_search, a, table=table)
+        self.assertEqual(['bound 0', 'bound 3'], sorted(stats.phases))
+        self.assertTrue(stats.duplicates > 0)
+        self.assertTrue(stats.expanded < first.expanded)
+    def test_profile(self):
+        fd, filename = tempfile.mkstemp(suffix=".prof")
+        os.close(fd)
+        os.environ['SEARCH_PROFILE'] = filename
+        try:
+            searchstats.solve(problem1.breath_search, base.b0*base.b1)
+            self.assertTrue(pstats.Stats(filename).total_calls > 0)
+        finally:
+            del os.environ['SEARCH_PROFILE']
+            os.remove(filename)
+    def test_phase(self):
+        stats = searchstats.searchstats()
+        with stats.Phase('x'):
+            pass
+        with stats.Phase('x'):
+            pass
+        self.assertEqual(['x'], list(stats.phases))
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
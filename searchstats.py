@@ -0,0 +1,132 @@
+"""
+Description:
+  counters and timers of a search.
+
+  the searches (problem1.breath_search, problem1.bidirectional_search,
+  ida.ida_search, twophase.twophase_search) take an optional searchstats
+  object and fill it in. the breadth first searches update the counters
+  once per depth, not per node, and do no extra work without stats;
+  the depth first searches (ida, twophase) count their nodes as they
+  go and add the counts to stats once per bound.
+
+    generated  ... states generated (one per state and move)
+    expanded   ... states whose successors were generated
+    duplicates ... generated states skipped as already seen (for ida:
+                   cut off by a bound stored in the transposition table)
+    frontier   ... size of each level (for ida: nodes of each iteration)
+    stored     ... most states kept at once
+    phases     ... seconds per named phase of the search
+    peak_rss   ... peak resident set size of the whole process in bytes,
+                   set by Finish; it includes everything the process did
+                   before the search and never decreases, so it bounds
+                   the memory of the search only from above
+
+  the callback, if given, is called with the stats object after every
+  level. solve runs a search and returns the solution together with
+  its stats; if the environment variable SEARCH_PROFILE names a file,
+  the search runs under cProfile and the profile is dumped to that file
+  (read it with pstats).
+"""
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+class _phase:
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, *exc):
+        self.stats.AddTime(self.name, time.time() - self.start)
+        return False
+
+class searchstats:
+    def __init__(self, callback=None):
+        self.callback   = callback
+        self.generated  = 0
+        self.expanded   = 0
+        self.duplicates = 0
+        self.frontier   = []
+        self.stored     = 0
+        self.phases     = {}
+        self.start      = time.time()
+        self.elapsed    = 0.0
+        self.peak_rss   = None
+
+    def Level(self, size):
+        """
+        Records the size of a finished level and calls the callback.
+        """
+        self.frontier.append(size)
+        self.elapsed = time.time() - self.start
+        if self.callback is not None:
+            self.callback(self)
+
+    def Store(self, count):
+        """
+        Records that count states are kept.
+        """
+        if count > self.stored:
+            self.stored = count
+
+    def AddTime(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def Phase(self, name):
+        """
+        Returns a context manager adding its time to phase name.
+        """
+        return _phase(self, name)
+
+    def Finish(self):
+        self.elapsed = time.time() - self.start
+        if resource is not None:
+            # the peak of the process so far: bytes on macOS, kilobytes
+            # elsewhere
+            self.peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if sys.platform != 'darwin':
+                self.peak_rss = self.peak_rss*1024
+
+    def NodesPerSecond(self):
+        if self.elapsed <= 0:
+            return 0.0
+        return self.expanded/self.elapsed
+
+    def AsDict(self):
+        return {'generated': self.generated, 'expanded': self.expanded,
+                'duplicates': self.duplicates, 'frontier': list(self.frontier),
+                'stored': self.stored, 'phases': dict(self.phases),
+                'elapsed': self.elapsed, 'nodes_per_sec': self.NodesPerSecond(),
+                'peak_rss': self.peak_rss}
+
+    def __repr__(self):
+        return "searchstats(%r)" % (self.AsDict(),)
+
+def solve(search, a, callback=None, **kwargs):
+    """
+    Returns (solution, stats) of search(a, stats=stats, **kwargs).
+    """
+    stats = searchstats(callback)
+    filename = os.environ.get('SEARCH_PROFILE')
+    if filename:
+        import cProfile
+        profile = cProfile.Profile()
+        try:
+            solution = profile.runcall(search, a, stats=stats, **kwargs)
+        finally:
+            profile.dump_stats(filename)
+    else:
+        solution = search(a, stats=stats, **kwargs)
+    stats.Finish()
+    return solution, stats
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
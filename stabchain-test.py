@@ -0,0 +1,35 @@
+from stabchain import stabchain
+from perm import perm
+import base
+import random
+import unittest
+
+class Test(unittest.TestCase):
+    def test_order_of_symmetric_group(self):
+        self.assertEqual(24, stabchain([perm(1,2,3,4), perm(1,2)]).Order())
+    def test_order_of_trivial_group(self):
+        self.assertEqual(1, stabchain([perm()]).Order())
+        self.assertEqual([], stabchain([perm()]).Base())
+    def test_order_of_cube_group(self):
+        self.assertEqual(43252003274489856000, stabchain(base.B).Order())
+    def test_contains(self):
+        G = stabchain(base.B)
+        self.assertTrue(G.Contains(base.b0*base.b5*base.b3.Inverse()))
+        self.assertTrue(G.Contains(base.b0.Identity()))
+        # a single corner twist or edge flip is not reachable
+        self.assertFalse(G.Contains(perm(1,10,52)))
+        self.assertFalse(G.Contains(perm(2,53)))
+        self.assertFalse(G.Contains(perm(60,61)))
+    def test_strong_generators_generate_group(self):
+        G = stabchain(base.B)
+        self.assertEqual(G.Order(), stabchain(G.StrongGenerators()).Order())
+    def test_random(self):
+        G = stabchain(base.B)
+        rng = random.Random(1)
+        for i in range(10):
+            self.assertTrue(G.Contains(G.Random(rng)))
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
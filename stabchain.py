@@ -0,0 +1,200 @@
+"""
+File    stabchain.py
+
+Description
+    Stabilizer chain of a permutation group given by generators,
+    computed with the deterministic Schreier-Sims algorithm.
+
+    The chain consists of base points b_0, b_1, ..., strong generators
+    and for every level i a Schreier transversal: for each point x in
+    the orbit of b_i under the stabilizer of b_0, ..., b_{i-1} an
+    element mapping b_i to x. Once built, the group order is the
+    product of the orbit lengths, and membership of a permutation is
+    tested by sifting it through the levels in polynomial time.
+
+    Internally permutations are tuples of images of the points
+    0, ..., degree-1, products are taken from left to right (first
+    apply a, then b) as in perm's default evaluation order.
+
+Example
+    >>> G = stabchain(base.B)
+    >>> G.Order()
+    43252003274489856000
+    >>> G.Contains(base.b0 * base.b1)
+    True
+"""
+import random
+from operator import itemgetter
+from perm import perm, frozenperm
+from orbit import orbit
+
+
+def _mul(a, b):
+    # first apply a, then b
+    return itemgetter(*a)(b)
+
+def _inverse(a):
+    r = [0] * len(a)
+    for i in range(len(a)):
+        r[a[i]] = i
+    return tuple(r)
+
+
+class _level:
+    """
+    One level of the chain: base point, strong generators fixing the
+    previous base points, the orbit of the base point (an orbit.orbit
+    whose Schreier vector gives the words of its points) and its
+    transversal. checked holds the (orbit point, generator index) pairs
+    whose Schreier generator has already been sifted.
+    """
+    def __init__(self, point, identity):
+        self.point   = point
+        self.orbit   = orbit(point, [], 'point', len(identity))
+        self.gens    = self.orbit.gens
+        self.trans   = {point: identity}
+        self.inverse = {point: identity}
+        self.checked = set()
+
+
+class stabchain:
+    """
+    Stabilizer chain of the group generated by a list of permutations.
+    """
+
+    def __init__(self, gens):
+        """
+        gens - list of permutations generating the group
+        """
+        self.degree   = max([g.size for g in gens] + [perm.PERM_BASE + 1])
+        self.identity = tuple(range(self.degree))
+        self.levels   = []
+        for g in gens:
+            g = self._Tuple(g)
+            if g != self.identity and self._Sift(g, 0)[0] != self.identity:
+                self._AddGenerator(g, 0)
+        self._SchreierSims()
+
+    def _Tuple(self, p):
+        return tuple([p[i] for i in range(self.degree)])
+
+    def _Perm(self, t):
+        return frozenperm.from_image(t, validate=False)
+
+    def _ExtendOrbit(self, level, g):
+        """
+        Adds the generator g to the level, extending its orbit and the
+        transversal: a new point y reached from x by generator j gets
+        trans[x] * gens[j].
+        """
+        o = level.orbit
+        for k in range(o.AddGenerators([g]), len(o)):
+            u = _mul(level.trans[o.elements[o.parent[k]]], o.gens[o.vector[k]])
+            level.trans[o.elements[k]] = u
+            level.inverse[o.elements[k]] = _inverse(u)
+
+    def _AddGenerator(self, g, first):
+        """
+        Adds g as strong generator to the levels first, ..., j where
+        j is the first level whose base point g moves, appending a new
+        base point if g fixes all of them. Returns j.
+        """
+        j = first
+        while j < len(self.levels) and g[self.levels[j].point] == self.levels[j].point:
+            j = j + 1
+        if j == len(self.levels):
+            point = perm.PERM_BASE
+            while g[point] == point:
+                point = point + 1
+            self.levels.append(_level(point, self.identity))
+        for k in range(first, j + 1):
+            self._ExtendOrbit(self.levels[k], g)
+        return j
+
+    def _Sift(self, g, first):
+        """
+        Sifts g through the levels starting at first. Returns the
+        residue and the level where sifting stopped.
+        """
+        for i in range(first, len(self.levels)):
+            level = self.levels[i]
+            x = g[level.point]
+            if x not in level.trans:
+                return g, i
+            if x != level.point:
+                g = _mul(g, level.inverse[x])
+        return g, len(self.levels)
+
+    def _SchreierSims(self):
+        i = len(self.levels) - 1
+        while i >= 0:
+            level = self.levels[i]
+            residue = None
+            for x in level.orbit:
+                for k in range(len(level.gens)):
+                    if (x, k) in level.checked:
+                        continue
+                    level.checked.add((x, k))
+                    g = level.gens[k]
+                    y = g[x]
+                    h = _mul(_mul(level.trans[x], g),
+                             level.inverse[y])
+                    if h == self.identity:
+                        continue
+                    h = self._Sift(h, i + 1)[0]
+                    if h != self.identity:
+                        residue = h
+                        break
+                if residue is not None:
+                    break
+            if residue is None:
+                i = i - 1
+            else:
+                i = self._AddGenerator(residue, i + 1)
+
+    def Base(self):
+        """
+        Returns the list of base points.
+        """
+        return [level.point for level in self.levels]
+
+    def StrongGenerators(self):
+        """
+        Returns the strong generating set as frozen permutations.
+        """
+        gens = []
+        for level in self.levels:
+            for g in level.gens:
+                if g not in gens:
+                    gens.append(g)
+        return [self._Perm(g) for g in gens]
+
+    def Order(self):
+        """
+        Returns the order of the group.
+        """
+        order = 1
+        for level in self.levels:
+            order = order * len(level.orbit)
+        return order
+
+    def Contains(self, p):
+        """
+        Returns True if permutation p is an element of the group.
+        """
+        if p.LargestMovedPoint() >= self.degree:
+            return False
+        return self._Sift(self._Tuple(p), 0)[0] == self.identity
+
+    def Random(self, rng=random):
+        """
+        rng - source of randomness with a choice() method
+
+        Returns a uniformly distributed random element of the group.
+        """
+        g = self.identity
+        for level in reversed(self.levels):
+            g = _mul(g, level.trans[rng.choice(level.orbit.elements)])
+        return self._Perm(g)
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
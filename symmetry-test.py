@@ -0,0 +1,78 @@
+import base
+import ida
+import os
+import patterndb
+import problem1
+import symmetry
+import tempfile
+import unittest
+
+class Test(unittest.TestCase):
+    def test_group(self):
+        S = symmetry.SYMMETRIES
+        self.assertEqual(48, len(set(S)))
+        self.assertTrue(S[0].IsIdentity())
+        for p in S[:24]:
+            for q in S:
+                self.assertTrue(p*q in S)
+        for p in S:
+            self.assertEqual(base.fixed_points, sorted([p[x] for x in base.fixed_points]))
+    def test_rotations(self):
+        # rotations form a subgroup, reflections do not
+        R = set(symmetry.ROTATIONS)
+        for p in symmetry.ROTATIONS:
+            for q in symmetry.ROTATIONS:
+                self.assertTrue(p*q in R)
+        self.assertFalse(symmetry.SYMMETRIES[24]*symmetry.SYMMETRIES[25] in symmetry.SYMMETRIES[24:])
+    def test_conjugates_are_moves(self):
+        moves = set(base.B) | set([b.Inverse() for b in base.B])
+        for q in symmetry.SYMMETRIES:
+            for b in base.B:
+                self.assertTrue(b.Conjugate(q) in moves)
+    def test_preserving(self):
+        self.assertEqual(48, len(symmetry.preserving(ida.GENERATORS)))
+        self.assertEqual(6, len(symmetry.BASE_SYMMETRIES))
+        for q in symmetry.BASE_SYMMETRIES:
+            self.assertEqual(set(base.B), set([b.Conjugate(q) for b in base.B]))
+        self.assertRaises(ValueError, symmetry.check_moves, None, base.B)
+        symmetry.check_moves(None, ida.GENERATORS)
+    def test_canonical(self):
+        s = base.b0*base.b2*base.b2*base.b5
+        conjugates = symmetry.conjugates(s)
+        self.assertEqual(48, len(conjugates))
+        self.assertEqual(s.Conjugate(symmetry.SYMMETRIES[5]), conjugates[5])
+        c = symmetry.canonical(s)
+        self.assertTrue(c in conjugates)
+        for t in conjugates:
+            self.assertEqual(c, symmetry.canonical(t))
+        self.assertTrue(symmetry.canonical(s.Identity()).IsIdentity())
+    def test_breath_search(self):
+        a = (base.b0*base.b5*base.b3*base.b0).Inverse()
+        moves = problem1.breath_search(a, symmetries=symmetry.BASE_SYMMETRIES)
+        self.assertEqual(len(problem1.breath_search(a)), len(moves))
+        self.assertRaises(ValueError, problem1.breath_search, a, None, symmetry.SYMMETRIES)
+    def test_pattern_database(self):
+        points = [2,8]
+        symmetries = symmetry.stabilizer(points, symmetry.preserving(ida.GENERATORS))
+        self.assertEqual(4, len(symmetries))
+        files = []
+        try:
+            for s in (None, symmetries):
+                fd, filename = tempfile.mkstemp(suffix=".pdb")
+                os.close(fd)
+                files.append(filename)
+                patterndb.Build(filename, points, ida.GENERATORS, s).Close()
+            data = []
+            for filename in files:
+                f = open(filename, 'rb')
+                data.append(f.read())
+                f.close()
+            self.assertEqual(data[0], data[1])
+        finally:
+            for filename in files:
+                os.remove(filename)
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
@@ -0,0 +1,167 @@
+"""
+Description:
+  the 48 spatial symmetries of the cube as permutations of the facelets.
+
+  every facelet of the net in base.py gets integer coordinates on the
+  surface of the cube (twice the position of its cubie plus the normal
+  of its face), and every signed permutation matrix of the coordinates
+  (24 rotations, 24 rotations combined with a reflection) permutes the
+  facelets, centers included.
+
+  conjugating a state s by a symmetry q, q^-1 s q (perm.Conjugate),
+  gives the same state seen from another side; every symmetry maps a
+  base permutation to a base permutation or to the inverse of one.
+  conjugates are exactly as far from the identity when the moves of a
+  search are closed under conjugation: all 48 symmetries preserve
+  ida.GENERATORS, but only 6 preserve base.B, whose opposite faces
+  turn in the same sense about their common axis (BASE_SYMMETRIES, see
+  preserving).
+
+  canonical picks one representative of every class of conjugate
+  states, the one with the smallest image array; searches and tables
+  keep only the representatives (see problem1.breath_search and
+  patterndb.Build), so their visited sets shrink by up to the number
+  of symmetries.
+
+Data:
+  FACELETS ... coordinates of the facelets 1..base.N
+  SYMMETRIES ... the 48 symmetries as byteperms, identity first, the 24
+                 rotations before the reflections
+  ROTATIONS ... SYMMETRIES[:24]
+  INVERSES ... INVERSES[k] is the inverse of SYMMETRIES[k]
+  BASE_SYMMETRIES ... the 6 symmetries preserving base.B
+"""
+import itertools
+import base
+from perm import byteperm, IDENTITY_BYTES, image_bytes
+
+# (first facelet, normal, position of row 0 column 0, row step, column step)
+_FACES = [(1,  (0,1,0),  (-1,1,-1), (0,0,1),  (1,0,0)),    # U
+          (10, (-1,0,0), (-1,1,-1), (0,-1,0), (0,0,1)),    # L
+          (19, (0,0,1),  (-1,1,1),  (0,-1,0), (1,0,0)),    # F
+          (28, (1,0,0),  (1,1,1),   (0,-1,0), (0,0,-1)),   # R
+          (37, (0,-1,0), (-1,-1,1), (0,0,-1), (1,0,0)),    # D
+          (46, (0,0,-1), (-1,-1,-1), (0,1,0), (1,0,0))]    # B
+
+def _coordinates():
+    points = {}
+    for first, normal, corner, row, column in _FACES:
+        for r in range(3):
+            for c in range(3):
+                position = [corner[x] + r*row[x] + c*column[x] for x in range(3)]
+                points[first+3*r+c] = tuple([2*position[x] + normal[x] for x in range(3)])
+    return points
+
+FACELETS = _coordinates()
+
+def _matrices():
+    # signed permutation matrices as (axes, signs), rotations first
+    rotations = []
+    reflections = []
+    for axes in itertools.permutations(range(3)):
+        inversions = len([1 for i in range(3) for j in range(i+1, 3) if axes[i] > axes[j]])
+        for signs in itertools.product((1,-1), repeat=3):
+            det = (-1)**inversions * signs[0]*signs[1]*signs[2]
+            if det == 1:
+                rotations.append((axes, signs))
+            else:
+                reflections.append((axes, signs))
+    return rotations + reflections
+
+def _symmetry(axes, signs):
+    facelet = dict([(point, f) for f, point in FACELETS.items()])
+    image = list(range(base.N+1))
+    for f, point in FACELETS.items():
+        image[f] = facelet[tuple([signs[x]*point[axes[x]] for x in range(3)])]
+    return byteperm.from_image(image)
+
+SYMMETRIES = [_symmetry(axes, signs) for axes, signs in _matrices()]
+ROTATIONS = SYMMETRIES[:24]
+INVERSES = [q.Inverse() for q in SYMMETRIES]
+
+_TABLES = [image_bytes(q, 256) for q in SYMMETRIES]
+_INVERSE_TABLES = [image_bytes(q, 256) for q in INVERSES]
+
+def _indices(symmetries):
+    if symmetries is None:
+        return list(range(len(SYMMETRIES)))
+    return [SYMMETRIES.index(q) for q in symmetries]
+
+def preserving(gens):
+    """
+    returns the symmetries q with q^-1 g q in gens for all g in gens.
+    """
+    moves = set([g.Freeze() for g in gens])
+    result = []
+    for k in range(len(SYMMETRIES)):
+        if all([INVERSES[k]*g*SYMMETRIES[k] in moves for g in gens]):
+            result.append(SYMMETRIES[k])
+    return result
+
+BASE_SYMMETRIES = preserving(base.B)
+
+def stabilizer(points, symmetries=None):
+    """
+    returns the symmetries (default all) mapping the set points to
+    itself.
+    """
+    points = set(points)
+    return [SYMMETRIES[k] for k in _indices(symmetries)
+            if set([SYMMETRIES[k][x] for x in points]) == points]
+
+def conjugates(state, symmetries=None):
+    """
+    returns the list of the conjugates q^-1 state q of state by the
+    symmetries (default all).
+    """
+    return [INVERSES[k]*state*SYMMETRIES[k] for k in _indices(symmetries)]
+
+class canonizer:
+    """
+    Computes canonical representatives of states under a fixed set of
+    symmetries, working on 256 byte image tables.
+    """
+
+    def __init__(self, symmetries=None):
+        indices = _indices(symmetries)
+        self.tables = [(_INVERSE_TABLES[k], _TABLES[k]) for k in indices]
+
+    def Key(self, state):
+        """
+        Returns the image (256 bytes) of the canonical representative of
+        state (a permutation or its image as bytes); conjugate states
+        have the same key.
+        """
+        if isinstance(state, bytes):
+            image = state + IDENTITY_BYTES[len(state):]
+        else:
+            image = image_bytes(state, 256)
+        # (q^-1 state q)[i] = q[state[q^-1[i]]]
+        return min([inverse.translate(image).translate(table)
+                    for inverse, table in self.tables])
+
+    def Canonical(self, state):
+        """
+        Returns the canonical representative of state as a byteperm.
+        """
+        return byteperm.from_image(self.Key(state)[:base.N+1], validate=False)
+
+def canonical(state, symmetries=None):
+    """
+    returns the conjugate of state by one of the symmetries (default
+    all) with the smallest image, the same for all conjugates.
+    """
+    return canonizer(symmetries).Canonical(state)
+
+def check_moves(symmetries, gens):
+    """
+    raises ValueError unless all symmetries preserve gens (default all
+    48), i.e. conjugate states are equally far from the identity in a
+    search with moves gens.
+    """
+    preserved = preserving(gens)
+    for k in _indices(symmetries):
+        if SYMMETRIES[k] not in preserved:
+            raise ValueError("symmetry: symmetry %d does not preserve the moves" % k)
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
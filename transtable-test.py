@@ -0,0 +1,58 @@
+import base
+import ida
+import transtable
+import unittest
+from transtable import transtable as table
+
+class Test(unittest.TestCase):
+    def test_store_lookup(self):
+        t = table(entries=100)
+        self.assertEqual(0, t.Lookup(12345))
+        t.Store(12345, 3)
+        self.assertEqual(3, t.Lookup(12345))
+        t.Store(12345, 2)
+        self.assertEqual(3, t.Lookup(12345))
+        t.Store(12345, 5)
+        self.assertEqual(5, t.Lookup(12345))
+        t.Store(-7, 300)
+        self.assertEqual(255, t.Lookup(-7))
+        self.assertEqual(2, len(t))
+    def test_memory(self):
+        t = table(memory=9000)
+        self.assertEqual(1000, t.entries)
+        self.assertEqual(9000, t.Memory())
+        for key in range(1, 5000):
+            t.Store(key*7919, key % 10)
+        self.assertEqual(1000, len(t))
+        self.assertEqual(9000, t.Memory())
+        self.assertRaises(ValueError, table, 10)
+    def test_depth_preferred_replacement(self):
+        n = 10
+        t = table(entries=n)
+        # keys with equal slots probe the same slots
+        keys = [k*n + 1 for k in range(1, transtable.PROBES+2)]
+        for k in range(transtable.PROBES):
+            t.Store(keys[k], 5+k)
+        t.Store(keys[-1], 1)
+        self.assertEqual(0, t.Lookup(keys[-1]))
+        t.Store(keys[-1], 7)
+        self.assertEqual(7, t.Lookup(keys[-1]))
+        self.assertEqual(0, t.Lookup(keys[0]))
+        self.assertEqual(6, t.Lookup(keys[1]))
+    def test_clear(self):
+        t = table(entries=10)
+        t.Store(3, 3)
+        t.Clear()
+        self.assertEqual(0, t.Lookup(3))
+        self.assertEqual(0, len(t))
+    def test_ida_search(self):
+        a = (base.b0*base.b5*base.b3*base.b3*base.b1).Inverse()
+        t = table(memory=2**20)
+        moves = ida.ida_search(a, table=t)
+        self.assertEqual(ida.ida_search(a), moves)
+        self.assertTrue(len(t) > 0)
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
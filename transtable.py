@@ -0,0 +1,126 @@
+"""
+File    transtable.py
+
+Description
+    Fixed-size transposition table for iterative deepening search.
+
+    The table maps a 64 bit key (the hash of a state, see ida._search)
+    to a lower bound of the number of moves still needed from it, which
+    the search learns when a subtree fails to reach the identity within
+    its bound. Later visits of the same state, in the same iteration
+    through another path or in a later iteration, use the larger of the
+    heuristic and the stored bound and cut the subtree off earlier.
+
+    The table is open addressed in two flat arrays, an array('Q') of
+    keys and a bytearray of bounds (9 bytes per entry), so its memory
+    is fixed when it is created. A key is looked for in PROBES
+    consecutive slots; when all of them are taken by other keys the
+    one with the smallest bound is replaced if the new bound is larger
+    (depth-preferred replacement: a larger bound stands for a larger
+    subtree searched). Keys are full 64 bit hashes; two states with the
+    same hash would share an entry, which is negligibly rare.
+
+Example
+    >>> table = transtable(memory=64*2**20)        # 64 MB
+    >>> ida.ida_search(a, heuristic, table=table)
+"""
+from array import array
+
+PROBES = 4
+ENTRY_SIZE = 9
+
+_MASK = (1 << 64) - 1
+
+
+class transtable:
+    """
+    Open addressed table of lower bounds keyed by 64 bit state hashes.
+    """
+
+    def __init__(self, memory=16*2**20, entries=None):
+        """
+        memory  - approximate size of the table in bytes
+        entries - number of entries, overrides memory
+        """
+        if entries is None:
+            entries = memory // ENTRY_SIZE
+        if entries < PROBES:
+            raise ValueError("transtable: at least %d entries are needed" % PROBES)
+        self.entries = entries
+        self.keys    = array('Q', bytes(8*entries))
+        self.bounds  = bytearray(entries)
+        self.lookups = 0
+        self.hits    = 0
+        self.stores  = 0
+
+    def _Key(self, key):
+        # 0 marks an empty slot
+        key = key & _MASK
+        if key == 0:
+            return 1
+        return key
+
+    def Lookup(self, key):
+        """
+        Returns the stored lower bound for key, 0 if there is none.
+        """
+        self.lookups = self.lookups + 1
+        key   = self._Key(key)
+        keys  = self.keys
+        slot  = key % self.entries
+        for i in range(PROBES):
+            k = keys[slot]
+            if k == key:
+                self.hits = self.hits + 1
+                return self.bounds[slot]
+            if k == 0:
+                return 0
+            slot = slot + 1
+            if slot == self.entries:
+                slot = 0
+        return 0
+
+    def Store(self, key, bound):
+        """
+        Records the lower bound for key, keeping the larger one if key
+        is stored already.
+        """
+        key    = self._Key(key)
+        bound  = min(bound, 255)
+        keys   = self.keys
+        bounds = self.bounds
+        slot   = key % self.entries
+        victim = None
+        for i in range(PROBES):
+            k = keys[slot]
+            if k == key:
+                if bound > bounds[slot]:
+                    bounds[slot] = bound
+                return
+            if k == 0:
+                victim = slot
+                break
+            if victim is None or bounds[slot] < bounds[victim]:
+                victim = slot
+            slot = slot + 1
+            if slot == self.entries:
+                slot = 0
+        if keys[victim] == 0 or bounds[victim] < bound:
+            keys[victim]   = key
+            bounds[victim] = bound
+            self.stores = self.stores + 1
+
+    def Clear(self):
+        self.keys   = array('Q', bytes(8*self.entries))
+        self.bounds = bytearray(self.entries)
+
+    def __len__(self):
+        return self.entries - self.keys.count(0)
+
+    def Memory(self):
+        """
+        Returns the number of bytes taken by the arrays.
+        """
+        return self.keys.itemsize*len(self.keys) + len(self.bounds)
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
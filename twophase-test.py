@@ -0,0 +1,61 @@
+import base
+import twophase
+from perm import perm
+from stabchain import stabchain
+import random
+import searchstats
+import os
+import tempfile
+import unittest
+
+def face_turns(moves):
+    return len([k for k in range(len(moves)) if k == 0 or moves[k] != moves[k-1]])
+
+class Test(unittest.TestCase):
+    def test_slice_coordinate(self):
+        self.assertEqual(twophase.SLICE_SOLVED, twophase.slice_coord(list(range(12))))
+        for r in (0, 100, twophase.N_SLICE-1):
+            occupied = twophase._slice_positions(r)
+            ep = [8 if occupied[j] else 0 for j in range(12)]
+            self.assertEqual(r, twophase.slice_coord(ep))
+    def test_tables_file(self):
+        fd, filename = tempfile.mkstemp(suffix=".tables")
+        try:
+            os.write(fd, b"\x80\x04truncated")
+            os.close(fd)
+            self.assertEqual(None, twophase._load_tables(filename))
+            twophase._save_tables(filename, {'twist': [1, 2]})
+            self.assertEqual(None, twophase._load_tables(filename))
+            tables = {'version': twophase.TABLES_VERSION, 'twist': [1, 2]}
+            twophase._save_tables(filename, tables)
+            self.assertEqual(tables, twophase._load_tables(filename))
+            directory, name = os.path.split(filename)
+            self.assertEqual([name], [x for x in os.listdir(directory) if x.startswith(name)])
+        finally:
+            os.remove(filename)
+        self.assertEqual(None, twophase._load_tables(filename))
+    def test_identity(self):
+        self.assertEqual([], twophase.twophase_search(base.b0.Identity()))
+    def test_random_states(self):
+        G = stabchain(base.B)
+        rng = random.Random(4)
+        for i in range(3):
+            a = G.Random(rng)
+            moves = twophase.twophase_search(a)
+            self.assertTrue(base.apply_moves(a, moves).IsIdentity())
+            self.assertTrue(face_turns(moves) <= 24)
+    def test_invalid_state(self):
+        with self.assertRaises(ValueError):
+            twophase.twophase_search(perm(2,53))
+    def test_stats(self):
+        a = (base.b0*base.b5*base.b3).Inverse()
+        moves, stats = searchstats.solve(twophase.twophase_search, a)
+        self.assertTrue(len(moves) > 0)
+        self.assertEqual(set(['check', 'tables', 'search']), set(stats.phases))
+        self.assertEqual(sum(stats.frontier), stats.generated)
+        self.assertTrue(0 < stats.expanded < stats.generated)
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
@@ -0,0 +1,355 @@
+"""
+Description:
+  two-phase (Kociemba) solver finding short, not necessarily optimal,
+  solutions of arbitrary cube states.
+
+  phase 1 brings the state into the subgroup G1 generated by quarter
+  turns of the U and D faces (base.b2, base.b3) and half turns of the
+  other faces: all corner and edge orientations are 0 and the four
+  middle layer edges are in the middle layer. phase 2 solves the state
+  within G1 using only those moves.
+
+  both phases are iterative deepening searches on small integer
+  coordinates of the state (see coord.py), moved by table lookups and
+  pruned by breadth first distance tables:
+
+    phase 1: twist (3^7), flip (2^11), slice (12 choose 4 positions of
+             the middle layer edges)
+    phase 2: corner permutation (8!), permutation of the U and D layer
+             edges (8!), permutation of the middle layer edges (4!)
+
+  the tables take a while to compute in pure Python; they are built on
+  first use and can be kept in a file (see init_tables).
+
+  moves are numbered as in ida.MOVES, move m turns face m//3 by m%3+1
+  quarter turns; the solution is returned in the format of
+  problem1.breath_search, a list of indices into base.B.
+"""
+import os
+import pickle
+import tempfile
+import time
+import base
+import coord
+import cubie
+import ida
+from coord import NMOVES, EDGE_MOVES, twist, flip, perm_rank, perm_unrank
+from stabchain import stabchain
+
+U_FACES = (2,3)
+PHASE2_MOVES = [m for m in range(NMOVES) if m//3 in U_FACES or m%3 == 1]
+
+N_SLICE = 495
+N_PERM8 = 40320
+N_PERM4 = 24
+SLICE_SOLVED = 494
+
+def _binomial(n, k):
+    if k < 0 or k > n:
+        return 0
+    r = 1
+    for i in range(k):
+        r = r*(n-i)//(i+1)
+    return r
+
+# coordinates
+
+def slice_coord(ep):
+    # rank of the set of positions holding the middle layer edges 8..11
+    r = 0
+    k = 0
+    for j in range(12):
+        if ep[j] >= 8:
+            k = k + 1
+            r = r + _binomial(j, k)
+    return r
+
+def _slice_positions(r):
+    occupied = [False]*12
+    for k in range(4, 0, -1):
+        j = k - 1
+        while _binomial(j+1, k) <= r:
+            j = j + 1
+        occupied[j] = True
+        r = r - _binomial(j, k)
+    return occupied
+
+# tables
+
+def _slice_table():
+    table = [[0]*N_SLICE for m in range(NMOVES)]
+    for r in range(N_SLICE):
+        occupied = _slice_positions(r)
+        ep = [8 if occupied[j] else 0 for j in range(12)]
+        for m in range(NMOVES):
+            table[m][r] = slice_coord([ep[k] for k, t in EDGE_MOVES[m]])
+    return table
+
+def _edge_perm_table(n, offset, count):
+    # permutation coordinate of the edges at positions offset..offset+n-1,
+    # defined for the phase 2 moves only
+    table = [[None]*count for m in range(NMOVES)]
+    for r in range(count):
+        p = perm_unrank(r, n)
+        for m in PHASE2_MOVES:
+            table[m][r] = perm_rank([p[EDGE_MOVES[m][offset+j][0]-offset] for j in range(n)])
+    return table
+
+def _pruning_table(table1, table2, n2, moves, start):
+    # breadth first distances in the product of two coordinates
+    size = len(table1[0])*n2
+    prune = bytearray([255])*size
+    prune[start] = 0
+    level = [start]
+    depth = 0
+    while level:
+        depth = depth + 1
+        next_level = []
+        for x in level:
+            x1 = x//n2
+            x2 = x % n2
+            for m in moves:
+                y = table1[m][x1]*n2 + table2[m][x2]
+                if prune[y] == 255:
+                    prune[y] = depth
+                    next_level.append(y)
+        level = next_level
+    return prune
+
+_tables = None
+
+# changes whenever the layout of the tables changes, so older files
+# are rebuilt instead of used
+TABLES_VERSION = 2
+
+def build_tables():
+    """
+    computes and returns all move and pruning tables.
+    """
+    t = {'version': TABLES_VERSION}
+    t['twist'] = coord.move_table('twist')
+    t['flip'] = coord.move_table('flip')
+    t['slice'] = _slice_table()
+    t['corners'] = coord.move_table('corners')
+    t['edges'] = _edge_perm_table(8, 0, N_PERM8)
+    t['slice_perm'] = _edge_perm_table(4, 8, N_PERM4)
+    moves = range(NMOVES)
+    t['twist_slice'] = _pruning_table(t['twist'], t['slice'], N_SLICE, moves, SLICE_SOLVED)
+    t['flip_slice'] = _pruning_table(t['flip'], t['slice'], N_SLICE, moves, SLICE_SOLVED)
+    t['corners_slice'] = _pruning_table(t['corners'], t['slice_perm'], N_PERM4, PHASE2_MOVES, 0)
+    t['edges_slice'] = _pruning_table(t['edges'], t['slice_perm'], N_PERM4, PHASE2_MOVES, 0)
+    return t
+
+def _load_tables(filename):
+    # the tables kept in filename, None if it is missing or unreadable
+    try:
+        f = open(filename, 'rb')
+    except OSError:
+        return None
+    try:
+        tables = pickle.load(f)
+    except Exception:
+        # truncated or foreign file: rebuild it
+        return None
+    finally:
+        f.close()
+    if not isinstance(tables, dict) or tables.get('version') != TABLES_VERSION:
+        return None
+    return tables
+
+def _save_tables(filename, tables):
+    # writes a temporary file next to filename and renames it, so
+    # readers never see a partial file and concurrent writers do not mix
+    directory, name = os.path.split(os.path.abspath(filename))
+    fd, tmp = tempfile.mkstemp(prefix=name + ".", suffix=".tmp", dir=directory)
+    try:
+        f = os.fdopen(fd, 'wb')
+        try:
+            pickle.dump(tables, f, pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        finally:
+            f.close()
+        os.replace(tmp, filename)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+def init_tables(filename=None):
+    """
+    makes the tables available, loading them from filename if it holds
+    them and otherwise building them (and saving them to filename if
+    given).
+    """
+    global _tables
+    if _tables is not None:
+        return
+    if filename is not None:
+        _tables = _load_tables(filename)
+        if _tables is not None:
+            return
+    _tables = build_tables()
+    if filename is not None:
+        _save_tables(filename, _tables)
+
+_group = None
+
+def is_valid(a):
+    """
+    returns True if state a can be reached by the base permutations.
+    """
+    global _group
+    if _group is None:
+        _group = stabchain(base.B)
+    return _group.Contains(a)
+
+# search
+
+class _timeout(Exception):
+    pass
+
+class _search:
+    def __init__(self, a, max_length, deadline):
+        self.cubies = cubie.from_perm(a)
+        self.max_length = max_length
+        self.deadline = deadline
+        self.nodes = 0
+        self.generated = 0
+        self.t = _tables
+
+    def check_time(self):
+        self.nodes = self.nodes + 1
+        if self.deadline is not None and self.nodes % 1000 == 0:
+            if time.time() > self.deadline:
+                raise _timeout()
+
+    def phase1(self, tw, fl, sl, togo, last, path):
+        t = self.t
+        if togo == 0:
+            if tw == 0 and fl == 0 and sl == SLICE_SOLVED:
+                # a last move of phase 2 type would make a shorter phase 1
+                if path and path[-1] in PHASE2_MOVES:
+                    return None
+                return self.start_phase2(path)
+            return None
+        self.check_time()
+        for m in range(NMOVES):
+            face = m//3
+            if not ida._allowed(face, last):
+                continue
+            self.generated = self.generated + 1
+            tw2 = t['twist'][m][tw]
+            fl2 = t['flip'][m][fl]
+            sl2 = t['slice'][m][sl]
+            if max(t['twist_slice'][tw2*N_SLICE+sl2],
+                   t['flip_slice'][fl2*N_SLICE+sl2]) >= togo:
+                continue
+            path.append(m)
+            result = self.phase1(tw2, fl2, sl2, togo-1, face, path)
+            if result is not None:
+                return result
+            path.pop()
+        return None
+
+    def start_phase2(self, path):
+        cp, co, ep, eo = self.cubies
+        for m in path:
+            for k in range(m%3+1):
+                cp, co, ep, eo = cubie.apply_move(m//3, cp, co, ep, eo)
+        c = perm_rank(cp)
+        e = perm_rank(ep[:8])
+        s = perm_rank([x-8 for x in ep[8:]])
+        last = path[-1]//3 if path else -1
+        limit = self.max_length - len(path)
+        t = self.t
+        depth = max(t['corners_slice'][c*N_PERM4+s], t['edges_slice'][e*N_PERM4+s])
+        while depth <= limit:
+            moves = []
+            if self.phase2(c, e, s, depth, last, moves):
+                return path + moves
+            depth = depth + 1
+        return None
+
+    def phase2(self, c, e, s, togo, last, path):
+        if togo == 0:
+            return c == 0 and e == 0 and s == 0
+        self.check_time()
+        t = self.t
+        for m in PHASE2_MOVES:
+            face = m//3
+            if not ida._allowed(face, last):
+                continue
+            self.generated = self.generated + 1
+            c2 = t['corners'][m][c]
+            e2 = t['edges'][m][e]
+            s2 = t['slice_perm'][m][s]
+            if max(t['corners_slice'][c2*N_PERM4+s2],
+                   t['edges_slice'][e2*N_PERM4+s2]) >= togo:
+                continue
+            path.append(m)
+            if self.phase2(c2, e2, s2, togo-1, face, path):
+                return True
+            path.pop()
+        return False
+
+def twophase_search(a, max_length=24, timeout=None, stats=None):
+    """
+    returns a solution of state a with at most max_length face turns
+    (quarter or half turns), or None if none was found within timeout
+    seconds. raises ValueError if a is not a reachable state.
+
+    with a searchstats object as stats, the nodes of every phase 1
+    depth are recorded as the frontier, and the time of checking the
+    state, loading the tables and searching as phases. the nodes cut
+    off by the distance tables are generated but not expanded.
+    """
+    start = time.time()
+    if not is_valid(a):
+        raise ValueError("twophase: state is not reachable by the base permutations")
+    if stats is not None:
+        stats.AddTime('check', time.time()-start)
+        start = time.time()
+    init_tables()
+    if stats is not None:
+        stats.AddTime('tables', time.time()-start)
+    deadline = None
+    if timeout is not None:
+        deadline = time.time() + timeout
+    search = _search(a, max_length, deadline)
+    cp, co, ep, eo = search.cubies
+    tw = twist(co)
+    fl = flip(eo)
+    sl = slice_coord(ep)
+    try:
+        for depth in range(max_length+1):
+            start = time.time()
+            generated = search.generated
+            # the start state
+            search.generated = search.generated + 1
+            result = search.phase1(tw, fl, sl, depth, -1, [])
+            if stats is not None:
+                stats.AddTime('search', time.time()-start)
+                stats.expanded = search.nodes
+                stats.generated = search.generated
+                stats.Store(depth+1)
+                stats.Level(search.generated-generated)
+            if result is not None:
+                return ida.expand([(m//3, m%3+1) for m in result])
+    except _timeout:
+        if stats is not None:
+            stats.expanded = search.nodes
+            stats.generated = search.generated
+    return None
+
+if __name__ == '__main__':
+    import random
+    init_tables()
+    rng = random.Random(1)
+    for i in range(3):
+        a = stabchain(base.B).Random(rng)
+        start = time.time()
+        moves = twophase_search(a)
+        print(len(moves), round(time.time()-start, 3), moves)
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
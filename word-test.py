@@ -0,0 +1,61 @@
+import base
+import word
+import numpy
+import unittest
+from perm import perm
+from permarray import permarray
+
+SEXY = (1,2,1,1,1,2,2,2)
+
+class Test(unittest.TestCase):
+    def test_empty_word(self):
+        self.assertTrue(word.evaluate([]).IsIdentity())
+    def test_evaluate(self):
+        moves = [0,2,5,5,3,1]
+        self.assertEqual(base.apply_moves(base.b0.Identity(), moves), word.evaluate(moves))
+    def test_subwords(self):
+        flat = list(SEXY) + [3] + list(SEXY)
+        self.assertEqual(word.evaluate(flat), word.evaluate([SEXY, 3, [list(SEXY)]]))
+        self.assertEqual(6, word.evaluate([SEXY]).Order())
+    def test_cache(self):
+        w = word.wordcache()
+        w.Evaluate([SEXY, SEXY, 4])
+        self.assertEqual(1, w.hits)
+        self.assertEqual(2, w.misses)
+        w.Evaluate([4, SEXY])
+        self.assertEqual(2, w.hits)
+    def test_cache_bound(self):
+        w = word.wordcache(maxsize=2)
+        for j in range(6):
+            w.Evaluate([j])
+        self.assertEqual(2, len(w.cache))
+        self.assertEqual([(4,), (5,)], list(w.cache))
+    def test_apply(self):
+        w = word.wordcache()
+        states = [base.b0, base.b1*base.b4, base.b5.Inverse()]
+        result = w.Apply([2,3,0], states)
+        for s, r in zip(states, result):
+            self.assertEqual(base.apply_moves(s, [2,3,0]), r)
+        self.assertEqual(base.apply_moves(base.b4, [1]), w.Apply([1], base.b4))
+        a = permarray(states, base.N+1)
+        self.assertEqual(result, a.Apply(w.Evaluate([2,3,0])).ToPerms())
+        self.assertEqual(result, w.Apply([2,3,0], a).ToPerms())
+    def test_integral_indices(self):
+        moves = [numpy.int64(2), numpy.uint8(3), (numpy.int32(1), 0)]
+        self.assertEqual(word.evaluate([2, 3, (1, 0)]), word.evaluate(moves))
+    def test_right_to_left(self):
+        w = word.wordcache()
+        w.Evaluate([1, 4])
+        perm.EVAL_ORDER = 0
+        try:
+            self.assertEqual(base.b4*base.b1, w.Evaluate([1, 4]))
+            self.assertEqual(base.b4*(base.b2*base.b0)*base.b1, w.Evaluate([1, (0, 2), 4]))
+            self.assertEqual(base.apply_moves(base.b3, [5, 0]), w.Apply([5, 0], base.b3))
+        finally:
+            perm.EVAL_ORDER = 1
+        self.assertEqual(base.b4*base.b1, w.Evaluate([1, 4]))
+
+if __name__ == '__main__':
+    unittest.main()
+
+# vim:expandtab:softtabstop=4:shiftwidth=4
@@ -0,0 +1,112 @@
+"""
+Description:
+  evaluation of words in the base permutations.
+
+  a word is a sequence of indices into the generators (base.B by
+  default) in the format of the solutions of problem1.breath_search:
+  applying the word [m0, m1, ..., mk] to a state s gives
+  B[mk] * ... * B[m1] * B[m0] * s. an element of a word may also be a
+  word itself (a subword such as a commutator or a macro), e.g.
+
+    sexy = (1,2,1,1,1,2,2,2)
+    scramble = [sexy, 3, sexy, sexy]
+
+  a wordcache evaluates a word in one pass over a 256 byte image table,
+  translating it through the byte table of each generator (in C, see
+  perm.byteperm) instead of building a permutation object per move.
+  bytes.translate cannot work in place, so every move makes a new 256
+  byte table, which is far cheaper than a perm and its product loop.
+  the products of subwords and words are kept in a bounded least
+  recently used cache, so macros used over and over are evaluated
+  once. the same word can be applied to many states at once.
+
+  products follow perm.EVAL_ORDER, as perm.__mul__ does; the cache is
+  cleared when the order is changed. move indices may be any integral
+  type (numpy integers included).
+"""
+from collections import OrderedDict
+import numbers
+import base
+from perm import perm, byteperm, IDENTITY_BYTES, image_bytes
+
+def _key(word):
+    return tuple([int(x) if isinstance(x, numbers.Integral) else _key(x) for x in word])
+
+class wordcache:
+    """
+    Evaluates words with a bounded cache of products of (sub)words.
+    """
+
+    def __init__(self, gens=None, maxsize=1024):
+        """
+        gens    - generators the word indices refer to, default base.B,
+                  all moving only points below 256
+        maxsize - number of (sub)word products kept
+        """
+        if gens is None:
+            gens = base.B
+        self.degree  = max([g.size for g in gens])
+        self.tables  = [image_bytes(g, 256) for g in gens]
+        self.maxsize = maxsize
+        self.cache   = OrderedDict()
+        self.order   = perm.EVAL_ORDER
+        self.hits    = 0
+        self.misses  = 0
+
+    def _Table(self, key):
+        # byte table of the product of the word key
+        table = self.cache.get(key)
+        if table is not None:
+            self.hits = self.hits + 1
+            self.cache.move_to_end(key)
+            return table
+        self.misses = self.misses + 1
+        # the product of the word so far; a translation applies a move
+        # after it, so left to right it is extended from the last move
+        table = IDENTITY_BYTES
+        if self.order == 0:  # right to left
+            letters = key
+        else:
+            letters = reversed(key)
+        for x in letters:
+            if isinstance(x, int):
+                table = table.translate(self.tables[x])
+            else:
+                table = table.translate(self._Table(x))
+        self.cache[key] = table
+        if len(self.cache) > self.maxsize:
+            self.cache.popitem(last=False)
+        return table
+
+    def Evaluate(self, word):
+        """
+        Returns the product of word as a byteperm.
+        """
+        if self.order != perm.EVAL_ORDER:
+            self.Clear()
+            self.order = perm.EVAL_ORDER
+        return byteperm.from_image(self._Table(_key(word))[:self.degree], validate=False)
+
+    def Apply(self, word, states):
+        """
+        states - a permutation, a list of permutations or a permarray
+
+        Returns word applied to each state.
+        """
+        w = self.Evaluate(word)
+        if hasattr(states, 'Apply'):
+            return states.Apply(w)
+        if isinstance(states, (list, tuple)):
+            return [w*s for s in states]
+        return w*states
+
+    def Clear(self):
+        self.cache.clear()
+
+def evaluate(word, gens=None):
+    """
+    Returns the product of word without caching.
+    """
+    return wordcache(gens, 0).Evaluate(word)
+
+# vim:expandtab:softtabstop=4:shiftwidth=4